@@ -1,4 +1,6 @@
+import contextlib
 import importlib
+import weakref
 from numbers import Number
 from time import sleep
 from typing import Literal
@@ -108,6 +110,38 @@ def lazy_load_widget(widget_name, widgets_list):
         raise KeyError(f"Widget {widget_name} not found in the dictionary.")
 
 
+# Function to connect a bound method without the handler keeping its owner alive;
+# the handler disconnects itself once the owner is gone, so long-lived services
+# don't pile up handlers from widgets whose destroy never ran
+def connect_weak(obj, signal_name, method):
+    method_ref = weakref.WeakMethod(method)
+    handler_id = None
+
+    def handler(*args):
+        bound = method_ref()
+        if bound is None:
+            with contextlib.suppress(TypeError, ValueError):
+                obj.disconnect(handler_id)
+            return False
+        return bound(*args)
+
+    handler_id = obj.connect(signal_name, handler)
+    return handler_id
+
+
+# Function to connect a widget's bound method the way g_signal_connect_object does:
+# held weakly, and disconnected as soon as the widget is destroyed
+def connect_object(obj, signal_name, method):
+    handler_id = connect_weak(obj, signal_name, method)
+
+    def on_owner_destroy(*_):
+        if obj.handler_is_connected(handler_id):
+            obj.disconnect(handler_id)
+
+    method.__self__.connect("destroy", on_owner_destroy)
+    return handler_id
+
+
 # Function to create a text icon label
 def text_icon(icon: str, props=None):
     label_props = {
@@ -1,7 +1,8 @@
 import contextlib
 import os
 import weakref
-from typing import Any, Callable, Dict, List, Tuple, Type, Union
+from functools import lru_cache
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, List, Set, Tuple, Type, Union
 
 import gi
 from fabric.utils import get_relative_path
@@ -45,10 +46,106 @@ gi.require_version("Gtk", "3.0")
 gi.require_version("Gdk", "3.0")
 gi.require_version("GObject", "2.0")
 
+_MISSING = object()
+_FAB_HAS_IS_CONNECTED = hasattr(util_fabricator, "handler_is_connected")
+_POPOVER_PARENT_TYPES = (Popover, Gtk.Popover)
+
+_UI = icons.get("ui", {})
+_POWER = icons.get("powermenu", {})
+_CUSTOM = icons.get("custom", {})
+ICON_CAMERA = str(_UI.get("camera", "camera-photo-symbolic"))
+ICON_CAMERA_VIDEO = str(_UI.get("camera-video", "video-display-symbolic"))
+ICON_LOGOUT = str(_POWER.get("logout", "system-log-out-symbolic"))
+ICON_RECORDING_STOP = str(_CUSTOM.get("recording_stop", "media-record-symbolic"))
+ICON_RECORDING_ACTIVE_BAR = str(_CUSTOM.get("recording_active_bar", "media-record-symbolic"))
+
+_NETWORK = icons.get("network", {})
+_NET_OFFLINE = str(icons.get("network-offline-symbolic", "network-offline-symbolic"))
+_NET_WIFI_DISABLED = str(_NETWORK.get("wifi", {}).get("disabled", "network-wireless-offline-symbolic"))
+_NET_WIRED_SYMBOLIC = str(_NETWORK.get("wired-symbolic", "network-wired-symbolic"))
+_NET_WIRED_NO_ROUTE = str(_NETWORK.get("wired-no-route-symbolic", "network-offline-symbolic"))
+_NET_PROPS_TO_WATCH = ("icon-name", "enabled", "state", "active-access-point", "carrier", "primary-device", "connectivity")
+
+_VOLUME = icons.get("audio", {}).get("volume", {})
+_AUDIO_ICON = {
+    "muted": str(_VOLUME.get("muted", "audio-volume-muted-symbolic")),
+    "low": str(_VOLUME.get("low", "audio-volume-low-symbolic")),
+    "medium": str(_VOLUME.get("medium", "audio-volume-medium-symbolic")),
+    "high": str(_VOLUME.get("high", "audio-volume-high-symbolic")),
+    "overamplified": str(_VOLUME.get("overamplified", "audio-volume-overamplified-symbolic")),
+}
+_AUDIO_ICON_TABLE = (_AUDIO_ICON["muted"], _AUDIO_ICON["low"], _AUDIO_ICON["medium"], _AUDIO_ICON["high"])
+# Same buckets as get_audio_icon_name: 0 -> muted, 1-32 -> low, 33-66 -> medium, 67-100 -> high.
+_VOL_BUCKETS = bytes([0] * 1 + [1] * 32 + [2] * 34 + [3] * 34)
+
+_BLUETOOTH = icons.get("bluetooth", {})
+_BT_DISABLED = str(_BLUETOOTH.get("disabled-symbolic", "bluetooth-disabled-symbolic"))
+_BT_ACTIVE = str(_BLUETOOTH.get("active-symbolic", "bluetooth-active-symbolic"))
+_BT_CONNECTED = str(_BLUETOOTH.get("connected-symbolic", _BT_ACTIVE))
+
+# Dirty bits coalesced into a single QuickSettingsButtonWidget._refresh_icons tick.
+_DIRTY_NET = 1
+_DIRTY_AUDIO = 2
+_DIRTY_BT = 4
+_DIRTY_SPEAKER = 8
+
+
+def _audio_icon_key(volume: int, muted: bool) -> str:
+    if muted or volume <= 0:
+        return _AUDIO_ICON["muted"]
+    if volume > 100:
+        return _AUDIO_ICON["overamplified"]
+    return _AUDIO_ICON_TABLE[_VOL_BUCKETS[volume]]
+
+
+@lru_cache(maxsize=16)
+def _resolve_lottie_path(config_path: str) -> Union[str, None]:
+    resolved_path = config_path
+    if not os.path.isabs(config_path) and (".." in config_path or not config_path.startswith("/")):
+        base_path_guess = os.path.dirname(os.path.abspath(__file__))
+        resolved_path = os.path.abspath(os.path.join(base_path_guess, config_path))
+    if os.path.exists(resolved_path):
+        return resolved_path
+    resolved_path = get_relative_path(config_path)
+    if os.path.exists(resolved_path):
+        return resolved_path
+    return None
+
+
+_props_cache: "weakref.WeakKeyDictionary[Any, FrozenSet[str]]" = weakref.WeakKeyDictionary()
+
+
+def _props_of(obj: Any) -> FrozenSet[str]:
+    names = _props_cache.get(obj)
+    if names is None:
+        list_properties = getattr(obj, "list_properties", None)
+        names = frozenset(pspec.name for pspec in list_properties()) if list_properties else frozenset()
+        with contextlib.suppress(TypeError):
+            _props_cache[obj] = names
+    return names
+
 
 class QuickSettingsButtonBox(Box):
     """A box to display the quick settings buttons."""
 
+    __slots__ = (
+        "_chevron_buttons",
+        "_reveal_clicked_handlers",
+        "active_submenu",
+        "all_created_submenus",
+        "grid",
+    )
+
+    TOGGLER_REGISTRY: ClassVar[Dict[str, Tuple[Type[Gtk.Widget], Union[Callable[[], QuickSubMenu], None]]]] = {
+        "wifi": (WifiToggle, WifiSubMenu),
+        "bluetooth": (BluetoothToggle, BluetoothSubMenu),
+        "home_assistant_lights": (HALightsToggle, HALightsSubMenu),
+        "power_profiles": (PowerProfileToggle, PowerProfileSubMenu),
+        "hypridle": (HyprIdleQuickSetting, None),
+        "hyprsunset": (HyprSunsetQuickSetting, None),
+        "notifications": (NotificationQuickSetting, None),
+    }
+
     def __init__(self, config: Dict[str, Any], **kwargs):
         super().__init__(
             orientation=Gtk.Orientation.VERTICAL,
@@ -70,16 +167,7 @@ class QuickSettingsButtonBox(Box):
         self.active_submenu: Union[QuickSubMenu, None] = None
         self.all_created_submenus: List[QuickSubMenu] = []
         self._reveal_clicked_handlers: List[Tuple[QSChevronButton, int]] = []
-
-        self.toggler_registry: Dict[str, Tuple[Type[Gtk.Widget], Union[Callable[[], Union[QuickSubMenu, None]], None]]] = {
-            "wifi": (WifiToggle, lambda: WifiSubMenu()),
-            "bluetooth": (BluetoothToggle, lambda: BluetoothSubMenu()),
-            "home_assistant_lights": (HALightsToggle, lambda: HALightsSubMenu()),
-            "power_profiles": (PowerProfileToggle, lambda: PowerProfileSubMenu()),
-            "hypridle": (HyprIdleQuickSetting, None),
-            "hyprsunset": (HyprSunsetQuickSetting, None),
-            "notifications": (NotificationQuickSetting, None),
-        }
+        self._chevron_buttons: List[QSChevronButton] = []
         toggler_definitions = config.get("togglers", [])
         max_cols = config.get("togglers_max_cols", 2)
         self._populate_togglers(toggler_definitions, max_cols)
@@ -98,12 +186,12 @@ class QuickSettingsButtonBox(Box):
                 toggler_type = item_config
             elif isinstance(item_config, dict):
                 toggler_type = item_config.get("type")
-            if not toggler_type or toggler_type not in self.toggler_registry:
+            if not toggler_type or toggler_type not in self.TOGGLER_REGISTRY:
                 continue
-            widget_class, submenu_factory = self.toggler_registry[toggler_type]
+            widget_class, submenu_factory = self.TOGGLER_REGISTRY[toggler_type]
             instance: Union[Gtk.Widget, None] = None
             try:
-                if submenu_factory:
+                if submenu_factory is not None:
                     submenu_instance = submenu_factory()
                     if submenu_instance is not None and not isinstance(submenu_instance, QuickSubMenu):
                         logger.warning(f"Submenu for {toggler_type} is not a QuickSubMenu.")
@@ -112,6 +200,7 @@ class QuickSettingsButtonBox(Box):
                     if submenu_instance is not None:
                         self.all_created_submenus.append(submenu_instance)
                     if isinstance(instance, QSChevronButton):
+                        self._chevron_buttons.append(instance)
                         handler_id = instance.connect("reveal-clicked", self.set_active_submenu)
                         self._reveal_clicked_handlers.append((instance, handler_id))
                 else:
@@ -135,10 +224,10 @@ class QuickSettingsButtonBox(Box):
             elif hasattr(self.active_submenu, "set_visible"):
                 self.active_submenu.set_visible(False)
 
-            for btn_widget_child in self.grid.get_children():
-                if isinstance(btn_widget_child, QSChevronButton) and getattr(btn_widget_child, "submenu", None) == self.active_submenu:
-                    if hasattr(btn_widget_child, "set_active"):
-                        btn_widget_child.set_active(False)
+            for chevron_button in self._chevron_buttons:
+                if getattr(chevron_button, "submenu", None) == self.active_submenu:
+                    if hasattr(chevron_button, "set_active"):
+                        chevron_button.set_active(False)
                     break
             self.active_submenu = None
 
@@ -176,15 +265,15 @@ class QuickSettingsButtonBox(Box):
     def destroy(self):
         logger.debug(f"QuickSettingsButtonBox ({self.get_name()}): Destroying.")
         for submenu in self.all_created_submenus:
-            if submenu and hasattr(submenu, "destroy"):
+            if submenu is not None:
                 submenu.destroy()
         self.all_created_submenus.clear()
 
         for button, handler_id in self._reveal_clicked_handlers:
-            if button and hasattr(button, "handler_is_connected") and button.handler_is_connected(handler_id):
-                with contextlib.suppress(Exception):
-                    button.disconnect(handler_id)
+            with contextlib.suppress(TypeError, ValueError):
+                button.disconnect(handler_id)
         self._reveal_clicked_handlers.clear()
+        self._chevron_buttons.clear()
 
         children_to_remove = list(self.grid.get_children())
         for child in children_to_remove:
@@ -198,6 +287,28 @@ class QuickSettingsButtonBox(Box):
 class QuickSettingsMenu(Box):
     """A menu to quick settings."""
 
+    __slots__ = (
+        "_cached_popover_parent",
+        "_last_screen_record_state",
+        "_screen_recorder_signal_id",
+        "_uptime_signal_handler_id",
+        "_uptime_update_callback_ref",
+        "audio_submenu",
+        "config",
+        "mic_submenu",
+        "quick_settings_button_box_instance",
+        "recorder_service",
+        "screen_record_button",
+        "screenrecord_action_config",
+        "screenshot_action_config",
+        "screenshot_button",
+        "uptime_box",
+        "uptime_icon_label",
+        "uptime_value_label",
+        "user_box",
+        "wlogout_button",
+    )
+
     def __init__(
         self, config: Dict[str, Any], screenshot_action_config: Dict[str, Any], screenrecord_action_config: Dict[str, Any], **kwargs
     ):
@@ -208,52 +319,34 @@ class QuickSettingsMenu(Box):
         self._uptime_signal_handler_id: Union[int, None] = None
         self.recorder_service = ScreenRecorder()
         self._screen_recorder_signal_id: Union[int, None] = None
-        self_ref = weakref.ref(self)
+        self._last_screen_record_state: Union[bool, None] = None
+        self.quick_settings_button_box_instance: Union[QuickSettingsButtonBox, None] = None
+        self.audio_submenu: Union[AudioSinkSubMenu, None] = None
+        self.mic_submenu: Union[MicroPhoneSubMenu, None] = None
+        self._cached_popover_parent: Union[Gtk.Widget, None] = None
+        self.connect("parent-set", lambda *_: setattr(self, "_cached_popover_parent", None))
 
-        def _hide_parent_popover():
-            menu_instance = self_ref()
-            if not menu_instance:
-                return
+        user_cfg = self.config.get("user", {})
+        controls_config = self.config.get("controls", {})
+        shortcuts_config = self.config.get("shortcuts", {})
+        media_config = self.config.get("media", {})
 
-            parent_popover = menu_instance.get_ancestor(Popover)
-            if not parent_popover:
-                parent_popover = menu_instance.get_ancestor(Gtk.Popover)
-
-            if parent_popover:
-                if hasattr(parent_popover, "close"):
-                    parent_popover.close()
-                elif hasattr(parent_popover, "popdown"):
-                    parent_popover.popdown()
-                elif hasattr(parent_popover, "hide"):
-                    parent_popover.hide()
-            else:
-                logger.warning("Could not find parent Popover to hide for QuickSettingsMenu.")
-
-        def _handle_screenshot_click(_btn: Gtk.Widget):
-            _hide_parent_popover()
-            path = str(self.screenshot_action_config.get("path", "Pictures/Screenshots"))
-            fullscreen = bool(self.screenshot_action_config.get("fullscreen", False))
-            save_copy = bool(self.screenshot_action_config.get("save_copy", True))
-            self.recorder_service.screenshot(path=path, fullscreen=fullscreen, save_copy=save_copy)
-
-        def _handle_screen_record_click(_btn: Gtk.Widget):
-            path = str(self.screenrecord_action_config.get("path", "Videos/Screencasts"))
-            allow_audio = bool(self.screenrecord_action_config.get("allow_audio", True))
-            fullscreen_record = bool(self.screenrecord_action_config.get("fullscreen", False))
-            if self.recorder_service.is_recording:
-                self.recorder_service.screenrecord_stop()
-            else:
-                _hide_parent_popover()
-                self.recorder_service.screenrecord_start(path=path, allow_audio=allow_audio, fullscreen=fullscreen_record)
+        self._build_user_box(user_cfg)
+        self.user_box.pack_end(self._build_action_buttons(), False, False, 0)
+        start_section_content, center_section_content = self._build_controls_section(controls_config, shortcuts_config)
+        media_player_section_content = self._build_media_section(media_config)
 
-        def _handle_wlogout_click(_btn: Gtk.Widget):
-            _hide_parent_popover()
-            try:
-                helpers.exec_shell_command_async("wlogout", lambda *_: None)
-            except Exception as e:
-                logger.error(f"Failed to execute wlogout: {e}")
+        main_layout_box = CenterBox(
+            orientation="v",
+            style_classes=["quick-settings-box"],
+            start_children=[start_section_content],
+            center_children=[center_section_content] if center_section_content else None,
+            end_children=[media_player_section_content] if media_player_section_content else None,
+        )
+        self.add(main_layout_box)
+        self._wire_signals()
 
-        user_cfg = self.config.get("user", {})
+    def _build_user_box(self, user_cfg: Dict[str, Any]) -> Box:
         user_image_path = user_cfg.get("avatar", "~/.face")
         user_image_file = os.path.expanduser(str(user_image_path))
         user_image = get_relative_path("../../assets/images/banner.jpg") if not os.path.exists(user_image_file) else user_image_file
@@ -264,7 +357,7 @@ class QuickSettingsMenu(Box):
         username_label = FabricLabel(label=username, v_align="center", h_align="start", style_classes=["user"])
 
         self.uptime_box = Box(orientation="h", spacing=10, h_align="start", v_align="center", style_classes=["uptime"])
-        self.uptime_icon_label = FabricLabel(label="", style_classes=["icon"], v_align="center")
+        self.uptime_icon_label = FabricLabel(label="", style_classes=["icon"], v_align="center")
         self.uptime_value_label = FabricLabel(label=helpers.uptime(), v_align="center")
         self.uptime_box.add(self.uptime_icon_label)
         self.uptime_box.add(self.uptime_value_label)
@@ -288,37 +381,33 @@ class QuickSettingsMenu(Box):
         user_info_vbox.add(username_label)
         user_info_vbox.add(self.uptime_box)
         self.user_box.pack_start(user_info_vbox, True, True, 10)
+        return self.user_box
 
-        wlogout_icon_name_raw = icons.get("powermenu", {}).get("logout", "system-log-out-symbolic")
-        wlogout_icon_name = str(wlogout_icon_name_raw) if wlogout_icon_name_raw is not None else "system-log-out-symbolic"
+    def _build_action_buttons(self) -> Box:
         self.wlogout_button = HoverButton(
-            image=FabricImage(icon_name=wlogout_icon_name, icon_size=16),
+            image=FabricImage(icon_name=ICON_LOGOUT, icon_size=16),
             tooltip_text="Power Menu",
             v_align=Gtk.Align.END,
-            on_clicked=_handle_wlogout_click,
+            on_clicked=self._handle_wlogout_click,
         )
         self.wlogout_button.get_style_context().add_class("quickaction-button")
         self.wlogout_button.set_halign(Gtk.Align.END)
 
         ss_tooltip = str(self.screenshot_action_config.get("tooltip", "Take Screenshot"))
-        ss_icon_raw = icons.get("ui", {}).get("camera", "camera-photo-symbolic")
-        ss_icon = str(ss_icon_raw) if ss_icon_raw is not None else "camera-photo-symbolic"
         self.screenshot_button = HoverButton(
-            image=FabricImage(icon_name=ss_icon, icon_size=16),
+            image=FabricImage(icon_name=ICON_CAMERA, icon_size=16),
             tooltip_text=ss_tooltip,
             v_align="center",
-            on_clicked=_handle_screenshot_click,
+            on_clicked=self._handle_screenshot_click,
         )
         self.screenshot_button.get_style_context().add_class("quickaction-button")
 
         initial_sr_tooltip = str(self.screenrecord_action_config.get("start_tooltip", "Start Recording"))
-        sr_icon_raw = icons.get("ui", {}).get("camera-video", "video-display-symbolic")
-        sr_icon = str(sr_icon_raw) if sr_icon_raw is not None else "video-display-symbolic"
         self.screen_record_button = HoverButton(
-            image=FabricImage(icon_name=sr_icon, icon_size=16),
+            image=FabricImage(icon_name=ICON_CAMERA_VIDEO, icon_size=16),
             tooltip_text=initial_sr_tooltip,
             v_align="center",
-            on_clicked=_handle_screen_record_click,
+            on_clicked=self._handle_screen_record_click,
         )
         self.screen_record_button.get_style_context().add_class("quickaction-button")
 
@@ -329,9 +418,9 @@ class QuickSettingsMenu(Box):
         action_buttons_master_vbox = Box(orientation=Gtk.Orientation.VERTICAL, spacing=2, v_align=Gtk.Align.CENTER)
         action_buttons_master_vbox.add(self.wlogout_button)
         action_buttons_master_vbox.add(bottom_action_buttons_hbox)
-        self.user_box.pack_end(action_buttons_master_vbox, False, False, 0)
+        return action_buttons_master_vbox
 
-        controls_config = self.config.get("controls", {})
+    def _build_controls_section(self, controls_config: Dict[str, Any], shortcuts_config: Dict[str, Any]) -> Tuple[Box, Union[Box, None]]:
         qobb_config_dict = {
             "togglers": controls_config.get("togglers", []),
             "togglers_max_cols": controls_config.get("togglers_max_cols", 2),
@@ -359,7 +448,7 @@ class QuickSettingsMenu(Box):
             for slider_name in configured_sliders:
                 slider_widget: Union[Gtk.Widget, None] = None
                 if slider_name == "volume":
-                    slider_widget = AudioSlider()
+                    slider_widget = AudioSlider(submenu_host=self)
                 elif slider_name == "microphone":
                     slider_widget = MicrophoneSlider()
                 elif slider_name == "brightness":
@@ -375,7 +464,6 @@ class QuickSettingsMenu(Box):
         if "microphone" in configured_sliders and self.mic_submenu:
             sliders_box_children_content.append(self.mic_submenu)
 
-        shortcuts_config = self.config.get("shortcuts", {})
         slider_class = "slider-box-long"
         shortcuts_widget = None
         if shortcuts_config and shortcuts_config.get("enabled", False) and shortcuts_config.get("items"):
@@ -385,11 +473,12 @@ class QuickSettingsMenu(Box):
                 shortcuts_config=shortcuts_config["items"], style_classes=["shortcuts-grid"], v_align="start", h_align="fill"
             )
 
+        has_sliders_content = active_sliders_count > 0 or len(sliders_box_children_content) > 1
         sliders_container_box = Box(
             orientation="v",
             spacing=10,
             style_classes=[slider_class],
-            children=sliders_box_children_content if sliders_grid.get_children() or len(sliders_box_children_content) > 1 else [],
+            children=sliders_box_children_content if has_sliders_content else [],
             h_expand=True,
             h_align="fill",
             vexpand=False,
@@ -397,7 +486,7 @@ class QuickSettingsMenu(Box):
 
         center_content_main_grid = Gtk.Grid(visible=True, column_spacing=10, hexpand=True, column_homogeneous=False)
         added_sliders_box = False
-        if sliders_container_box.get_children():
+        if has_sliders_content:
             col_span = 2 if shortcuts_widget else 1
             center_content_main_grid.attach(sliders_container_box, 0, 0, col_span, 1)
             added_sliders_box = True
@@ -414,46 +503,96 @@ class QuickSettingsMenu(Box):
             h_align="fill",
         )
         start_section_content.set_valign(Gtk.Align.START)
-        center_section_content = Box(
-            orientation="v",
-            style_classes=["section-box"],
-            children=[center_content_main_grid] if center_content_main_grid.get_children() else [],
-            hexpand=True,
-            h_align="fill",
-        )
 
-        media_player_section_content = None
-        media_config = self.config.get("media", {})
-        if media_config.get("enabled", False):
-            media_player_section_content = Box(
+        center_section_content = None
+        if added_sliders_box or shortcuts_widget is not None:
+            center_section_content = Box(
                 orientation="v",
-                spacing=10,
                 style_classes=["section-box"],
-                children=(PlayerBoxStack(MprisPlayerManager(), config=media_config)),
+                children=[center_content_main_grid],
                 hexpand=True,
                 h_align="fill",
             )
+        return start_section_content, center_section_content
 
-        cb_start_children = [start_section_content] if start_section_content.get_children() else None
-        cb_center_children = [center_section_content] if center_section_content.get_children() else None
-        cb_end_children = [media_player_section_content] if media_player_section_content else None
-
-        main_layout_box = CenterBox(
+    def _build_media_section(self, media_config: Dict[str, Any]) -> Union[Box, None]:
+        if not media_config.get("enabled", False):
+            return None
+        return Box(
             orientation="v",
-            style_classes=["quick-settings-box"],
-            start_children=cb_start_children,
-            center_children=cb_center_children,
-            end_children=cb_end_children,
+            spacing=10,
+            style_classes=["section-box"],
+            children=(PlayerBoxStack(MprisPlayerManager(), config=media_config)),
+            hexpand=True,
+            h_align="fill",
         )
-        self.add(main_layout_box)
 
-        if self.recorder_service:
+    def _wire_signals(self):
+        self._uptime_update_callback_ref = lambda _s, val: self.uptime_value_label.set_label(val.get("uptime", "N/A"))
+        self.connect("map", self._on_menu_mapped)
+        self.connect("unmap", self._on_menu_unmapped)
+
+    def _hide_parent_popover(self):
+        parent_popover = self._cached_popover_parent
+        if parent_popover is None:
+            parent_popover = self.get_parent()
+            while parent_popover and not isinstance(parent_popover, _POPOVER_PARENT_TYPES):
+                parent_popover = parent_popover.get_parent()
+            self._cached_popover_parent = parent_popover
+
+        if parent_popover:
+            if hasattr(parent_popover, "close"):
+                parent_popover.close()
+            elif hasattr(parent_popover, "popdown"):
+                parent_popover.popdown()
+            elif hasattr(parent_popover, "hide"):
+                parent_popover.hide()
+        else:
+            logger.warning("Could not find parent Popover to hide for QuickSettingsMenu.")
+
+    def _handle_screenshot_click(self, _btn: Gtk.Widget):
+        self._hide_parent_popover()
+        path = str(self.screenshot_action_config.get("path", "Pictures/Screenshots"))
+        fullscreen = bool(self.screenshot_action_config.get("fullscreen", False))
+        save_copy = bool(self.screenshot_action_config.get("save_copy", True))
+        self.recorder_service.screenshot(path=path, fullscreen=fullscreen, save_copy=save_copy)
+
+    def _handle_screen_record_click(self, _btn: Gtk.Widget):
+        path = str(self.screenrecord_action_config.get("path", "Videos/Screencasts"))
+        allow_audio = bool(self.screenrecord_action_config.get("allow_audio", True))
+        fullscreen_record = bool(self.screenrecord_action_config.get("fullscreen", False))
+        if self.recorder_service.is_recording:
+            self.recorder_service.screenrecord_stop()
+        else:
+            self._hide_parent_popover()
+            self.recorder_service.screenrecord_start(path=path, allow_audio=allow_audio, fullscreen=fullscreen_record)
+
+    def _handle_wlogout_click(self, _btn: Gtk.Widget):
+        self._hide_parent_popover()
+        try:
+            helpers.exec_shell_command_async("wlogout", lambda *_: None)
+        except Exception as e:
+            logger.error(f"Failed to execute wlogout: {e}")
+
+    def _on_menu_mapped(self, *_args):
+        if self.recorder_service and self._screen_recorder_signal_id is None:
             self._screen_recorder_signal_id = self.recorder_service.connect("recording", self._update_screen_record_button_state)
+        if self.recorder_service:
             GLib.idle_add(self._update_screen_record_button_state, self.recorder_service, self.recorder_service.is_recording)
 
-        self._uptime_update_callback_ref = lambda _s, val: self.uptime_value_label.set_label(val.get("uptime", "N/A"))
-        if util_fabricator:
+        if util_fabricator and self._uptime_signal_handler_id is None:
             self._uptime_signal_handler_id = util_fabricator.connect("changed", self._uptime_update_callback_ref)
+            self.uptime_value_label.set_label(helpers.uptime())
+
+    def _on_menu_unmapped(self, *_args):
+        if self._uptime_signal_handler_id is not None:
+            with contextlib.suppress(Exception):
+                util_fabricator.disconnect(self._uptime_signal_handler_id)
+            self._uptime_signal_handler_id = None
+        if self.recorder_service and self._screen_recorder_signal_id is not None:
+            with contextlib.suppress(Exception):
+                self.recorder_service.disconnect(self._screen_recorder_signal_id)
+            self._screen_recorder_signal_id = None
 
     def _update_screen_record_button_state(self, _service: ScreenRecorder, is_recording: bool):
         if not (
@@ -482,19 +621,19 @@ class QuickSettingsMenu(Box):
             logger.debug("[QuickSettingsMenu] actual_image_widget for screen_record_button not valid/realized, skipping update.")
             return GLib.SOURCE_REMOVE
 
+        if self._last_screen_record_state == is_recording:
+            return GLib.SOURCE_REMOVE
+        self._last_screen_record_state = is_recording
+
         tooltip_text = ""
         icon_name = ""
 
         if is_recording:
-            icon_name_raw = self.screenrecord_action_config.get(
-                "menu_icon_active", icons.get("custom", {}).get("recording_stop", "media-record-symbolic")
-            )
+            icon_name_raw = self.screenrecord_action_config.get("menu_icon_active", ICON_RECORDING_STOP)
             icon_name = str(icon_name_raw) if icon_name_raw is not None else "media-record-symbolic"
             tooltip_text = str(self.screenrecord_action_config.get("stop_tooltip", "Stop Recording"))
         else:
-            icon_name_raw = self.screenrecord_action_config.get(
-                "menu_icon_idle", icons.get("ui", {}).get("camera-video", "video-display-symbolic")
-            )
+            icon_name_raw = self.screenrecord_action_config.get("menu_icon_idle", ICON_CAMERA_VIDEO)
             icon_name = str(icon_name_raw) if icon_name_raw is not None else "video-display-symbolic"
             tooltip_text = str(self.screenrecord_action_config.get("start_tooltip", "Start Recording"))
 
@@ -508,33 +647,26 @@ class QuickSettingsMenu(Box):
         logger.debug(f"QuickSettingsMenu ({self.get_name()}): Destroying.")
         if (
             self._uptime_signal_handler_id is not None
-            and util_fabricator
-            and hasattr(util_fabricator, "handler_is_connected")
+            and _FAB_HAS_IS_CONNECTED
             and util_fabricator.handler_is_connected(self._uptime_signal_handler_id)
         ):
             util_fabricator.disconnect(self._uptime_signal_handler_id)
             self._uptime_signal_handler_id = None
 
-        if hasattr(self, "recorder_service") and self.recorder_service and self._screen_recorder_signal_id is not None:
-            if hasattr(self.recorder_service, "handler_is_connected") and self.recorder_service.handler_is_connected(
-                self._screen_recorder_signal_id
-            ):
+        if self.recorder_service is not None and self._screen_recorder_signal_id is not None:
+            if self.recorder_service.handler_is_connected(self._screen_recorder_signal_id):
                 with contextlib.suppress(Exception):
                     self.recorder_service.disconnect(self._screen_recorder_signal_id)
             self._screen_recorder_signal_id = None
 
-        if (
-            hasattr(self, "quick_settings_button_box_instance")
-            and self.quick_settings_button_box_instance
-            and hasattr(self.quick_settings_button_box_instance, "destroy")
-        ):
+        if self.quick_settings_button_box_instance is not None:
             self.quick_settings_button_box_instance.destroy()
             self.quick_settings_button_box_instance = None
 
-        if hasattr(self, "audio_submenu") and self.audio_submenu and hasattr(self.audio_submenu, "destroy"):
+        if self.audio_submenu is not None:
             self.audio_submenu.destroy()
             self.audio_submenu = None
-        if hasattr(self, "mic_submenu") and self.mic_submenu and hasattr(self.mic_submenu, "destroy"):
+        if self.mic_submenu is not None:
             self.mic_submenu.destroy()
             self.mic_submenu = None
 
@@ -545,6 +677,49 @@ class QuickSettingsMenu(Box):
 class QuickSettingsButtonWidget(ButtonWidget):
     """A button to display icons and open the menu."""
 
+    __slots__ = (
+        "_audio_speaker_changed_handler_id",
+        "_bt_connected_handler_id",
+        "_bt_devices_handler_id",
+        "_bt_enabled_handler_id",
+        "_conn_spk_inst",
+        "_deferred_icon_updates",
+        "_dirty_mask",
+        "_indicator_interaction_in_progress",
+        "_last_icon_names",
+        "_lottie_path_config",
+        "_lottie_play",
+        "_lottie_scale_config",
+        "_lottie_stop",
+        "_network_device_ready_sid",
+        "_network_icon_name_devices",
+        "_network_pending_client",
+        "_network_primary_dev_sid",
+        "_network_prop_handler_ids",
+        "_popover_closed_handler_id",
+        "_raw_recording_indicator_widget",
+        "_recording_indicator_placeholder",
+        "_refresh_pending",
+        "_screen_recorder_bar_signal_id",
+        "_speaker_mut_h",
+        "_speaker_vol_h",
+        "_wifi_icon_fetcher",
+        "audio",
+        "audio_icon",
+        "bluetooth_icon",
+        "bluetooth_service",
+        "icon_container",
+        "network",
+        "network_icon",
+        "panel_icon_size",
+        "popup",
+        "quick_settings_menu_content_config",
+        "recorder_service",
+        "recording_indicator_event_box",
+        "screenrecord_action_config",
+        "screenshot_action_config",
+    )
+
     def __init__(self, widget_config: BarConfig, **kwargs):
         qs_menu_structure_config_raw = widget_config.get("quick_settings", {})
         qs_menu_structure_config: Dict[str, Any] = qs_menu_structure_config_raw if isinstance(qs_menu_structure_config_raw, dict) else {}
@@ -576,57 +751,33 @@ class QuickSettingsButtonWidget(ButtonWidget):
         self.network_icon = FabricImage(style_classes=["panel-icon"], visible=True)
         self.audio_icon = FabricImage(style_classes=["panel-icon"], visible=True)
         self.bluetooth_icon = FabricImage(style_classes=["panel-icon"], visible=True)
+        self._last_icon_names: Dict[FabricImage, str] = {}
 
-        lottie_path_config = str(self.screenrecord_action_config.get("bar_lottie_path", "../../assets/icons/lottie/recording.json"))
-        lottie_scale_config = float(self.screenrecord_action_config.get("bar_lottie_scale", 0.3))
-        actual_lottie_file_path = ""
-
-        self._raw_recording_indicator_widget: Union[LottieAnimationWidget, FabricImage]
-
-        try:
-            actual_lottie_file_path = lottie_path_config
-            if not os.path.isabs(lottie_path_config) and (".." in lottie_path_config or not lottie_path_config.startswith("/")):
-                base_path_guess = os.path.dirname(os.path.abspath(__file__))
-                actual_lottie_file_path = os.path.abspath(os.path.join(base_path_guess, lottie_path_config))
-            if not os.path.exists(actual_lottie_file_path):
-                actual_lottie_file_path = get_relative_path(lottie_path_config)
-                if not os.path.exists(actual_lottie_file_path):
-                    raise FileNotFoundError(f"Lottie file not found at {lottie_path_config} or resolved paths {actual_lottie_file_path}")
-            self._raw_recording_indicator_widget = LottieAnimationWidget(
-                LottieAnimation.from_file(actual_lottie_file_path), scale=lottie_scale_config, visible=False
-            )
-        except Exception as e:
-            logger.debug(
-                f"[QSButtonWidget] Lottie load FAILED (path: '{lottie_path_config}', resolved: '{actual_lottie_file_path}'): {e}. Using static icon fallback."
-            )
-            fallback_icon_name_raw = self.screenrecord_action_config.get(
-                "bar_icon_active", icons.get("custom", {}).get("recording_active_bar", "media-record-symbolic")
-            )
-            fallback_icon_name = str(fallback_icon_name_raw) if fallback_icon_name_raw is not None else "media-record-symbolic"
-            self._raw_recording_indicator_widget = FabricImage(
-                icon_name=fallback_icon_name,
-                icon_size=self.panel_icon_size,
-                style_classes=["panel-icon", "recording-indicator", "recording-indicator-active"],
-                visible=False,
-            )
+        self._lottie_path_config = str(self.screenrecord_action_config.get("bar_lottie_path", "../../assets/icons/lottie/recording.json"))
+        self._lottie_scale_config = float(self.screenrecord_action_config.get("bar_lottie_scale", 0.3))
+        self._raw_recording_indicator_widget: Union[LottieAnimationWidget, FabricImage, None] = None
+        # play_loop/stop_play of the indicator, bound once it is built; None for the static icon fallback.
+        self._lottie_play: Union[Callable[[], Any], None] = None
+        self._lottie_stop: Union[Callable[[], Any], None] = None
 
+        self._recording_indicator_placeholder = Gtk.Box(visible=False)
         self.recording_indicator_event_box = Gtk.EventBox()
         self.recording_indicator_event_box.set_visible_window(False)
-        self.recording_indicator_event_box.add(self._raw_recording_indicator_widget)
+        self.recording_indicator_event_box.add(self._recording_indicator_placeholder)
 
         self._indicator_interaction_in_progress = False
         self.recording_indicator_event_box.connect("button-press-event", self._on_recording_indicator_press)
         self.recording_indicator_event_box.connect("button-release-event", self._on_recording_indicator_release)
 
         self.recording_indicator_event_box.set_sensitive(False)
-        self._raw_recording_indicator_widget.connect(
-            "notify::visible", lambda obj, pspec: self.recording_indicator_event_box.set_visible(obj.get_visible())
-        )
         self.recording_indicator_event_box.set_tooltip_text("Stop Recording (when active)")
 
         self._network_primary_dev_sid: Union[int, None] = None
         self._network_device_ready_sid: Union[int, None] = None
-        self._network_prop_handler_ids: List[Tuple[Any, int]] = []
+        self._network_prop_handler_ids: List[Tuple[Callable[[int], None], int]] = []
+        # Devices whose "icon-name" property was found when their handlers were wired up.
+        self._network_icon_name_devices: Set[Any] = set()
+        self._wifi_icon_fetcher: Union[Callable[[], Any], None] = None
         self._bt_enabled_handler_id: Union[int, None] = None
         self._bt_connected_handler_id: Union[int, None] = None
         self._bt_devices_handler_id: Union[int, None] = None
@@ -634,6 +785,13 @@ class QuickSettingsButtonWidget(ButtonWidget):
         self._speaker_vol_h: Union[int, None] = None
         self._speaker_mut_h: Union[int, None] = None
         self._conn_spk_inst: Union[Any, None] = None
+        self._network_pending_client: Union[Any, None] = None
+        # _DIRTY_* bits waiting for the next _refresh_icons idle tick.
+        self._dirty_mask = 0
+        self._refresh_pending = False
+        # Icon updaters skipped while the bar button was unmapped, replayed on "map".
+        self._deferred_icon_updates: Set[Callable[..., Any]] = set()
+        self.connect("map", self._on_map_replay_icon_updates)
 
         if self.network:
             self._network_primary_dev_sid = self.network.connect("notify::primary-device", self._on_network_property_changed_cb)
@@ -647,11 +805,8 @@ class QuickSettingsButtonWidget(ButtonWidget):
             self._screen_recorder_bar_signal_id = self.recorder_service.connect("recording", self._on_recording_state_changed_bar)
 
         if self.network:
-            GLib.idle_add(self.on_network_device_ready, self.network)
-        else:
-            GLib.idle_add(self.update_network_icon)
-        GLib.idle_add(self.on_speaker_changed)
-        GLib.idle_add(self.update_bluetooth_icon)
+            self._network_pending_client = self.network
+        self._schedule_refresh(_DIRTY_NET | _DIRTY_SPEAKER | _DIRTY_BT)
         GLib.idle_add(self._on_recording_state_changed_bar, self.recorder_service, self.recorder_service.is_recording)
 
         self.icon_container = Box(orientation="h", spacing=2, visible=True)
@@ -691,17 +846,50 @@ class QuickSettingsButtonWidget(ButtonWidget):
         self._indicator_interaction_in_progress = False
         return should_consume_event
 
+    def _build_recording_indicator_widget(self) -> Union[LottieAnimationWidget, FabricImage]:
+        lottie_path_config = self._lottie_path_config
+        try:
+            actual_lottie_file_path = _resolve_lottie_path(lottie_path_config)
+            if actual_lottie_file_path is None:
+                raise FileNotFoundError(f"Lottie file not found at {lottie_path_config}")
+            return LottieAnimationWidget(LottieAnimation.from_file(actual_lottie_file_path), scale=self._lottie_scale_config, visible=False)
+        except Exception as e:
+            logger.debug(f"[QSButtonWidget] Lottie load FAILED (path: '{lottie_path_config}'): {e}. Using static icon fallback.")
+            fallback_icon_name_raw = self.screenrecord_action_config.get("bar_icon_active", ICON_RECORDING_ACTIVE_BAR)
+            fallback_icon_name = str(fallback_icon_name_raw) if fallback_icon_name_raw is not None else "media-record-symbolic"
+            return FabricImage(
+                icon_name=fallback_icon_name,
+                icon_size=self.panel_icon_size,
+                style_classes=["panel-icon", "recording-indicator", "recording-indicator-active"],
+                visible=False,
+            )
+
+    def _ensure_recording_indicator_widget(self) -> Union[LottieAnimationWidget, FabricImage]:
+        if self._raw_recording_indicator_widget is None:
+            self._raw_recording_indicator_widget = self._build_recording_indicator_widget()
+            self._lottie_play = getattr(self._raw_recording_indicator_widget, "play_loop", None)
+            self._lottie_stop = getattr(self._raw_recording_indicator_widget, "stop_play", None)
+            self.recording_indicator_event_box.remove(self._recording_indicator_placeholder)
+            self._recording_indicator_placeholder.destroy()
+            self.recording_indicator_event_box.add(self._raw_recording_indicator_widget)
+            self._raw_recording_indicator_widget.connect(
+                "notify::visible", lambda obj, pspec: self.recording_indicator_event_box.set_visible(obj.get_visible())
+            )
+        return self._raw_recording_indicator_widget
+
     def _on_recording_state_changed_bar(self, _service: ScreenRecorder, is_recording: bool):
         if is_recording:
-            self._raw_recording_indicator_widget.show()
-            if hasattr(self._raw_recording_indicator_widget, "play_loop"):
-                self._raw_recording_indicator_widget.play_loop()
+            indicator_widget = self._ensure_recording_indicator_widget()
+            indicator_widget.show()
+            if self._lottie_play is not None:
+                self._lottie_play()
             self.recording_indicator_event_box.set_sensitive(True)
             self.recording_indicator_event_box.set_tooltip_text("Stop Recording")
         else:
-            if hasattr(self._raw_recording_indicator_widget, "stop_play"):
-                self._raw_recording_indicator_widget.stop_play()
-            self._raw_recording_indicator_widget.hide()
+            if self._raw_recording_indicator_widget is not None:
+                if self._lottie_stop is not None:
+                    self._lottie_stop()
+                self._raw_recording_indicator_widget.hide()
             self.recording_indicator_event_box.set_sensitive(False)
             self.recording_indicator_event_box.set_tooltip_text("")
             self._indicator_interaction_in_progress = False
@@ -810,103 +998,133 @@ class QuickSettingsButtonWidget(ButtonWidget):
         return GLib.SOURCE_REMOVE
 
     def _connect_bluetooth_device_signals(self):
-        if not self.bluetooth_service or not hasattr(self.bluetooth_service, "find_property"):
+        if not self.bluetooth_service:
             return
+        props = _props_of(self.bluetooth_service)
         with contextlib.suppress(Exception):
-            if self.bluetooth_service.find_property("connected-devices"):
+            if "connected-devices" in props:
                 self._bt_connected_handler_id = self.bluetooth_service.connect(
                     "notify::connected-devices", self._on_bluetooth_property_changed_cb
                 )
-            if self.bluetooth_service.find_property("devices"):
+            if "devices" in props:
                 self._bt_devices_handler_id = self.bluetooth_service.connect("notify::devices", self._on_bluetooth_property_changed_cb)
 
+    def _schedule_refresh(self, bits: int):
+        self._dirty_mask |= bits
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        GLib.idle_add(self._refresh_icons)
+
+    def _refresh_icons(self):
+        # Rewiring below marks icons dirty again; the tick stays pending so that folds into this pass.
+        if self._dirty_mask & _DIRTY_SPEAKER:
+            self._dirty_mask &= ~_DIRTY_SPEAKER
+            self.on_speaker_changed()
+        client = self._network_pending_client
+        if client is not None:
+            self._network_pending_client = None
+            self.on_network_device_ready(client)
+
+        mask = self._dirty_mask
+        self._dirty_mask = 0
+        self._refresh_pending = False
+        if mask & _DIRTY_NET:
+            self.update_network_icon()
+        if mask & _DIRTY_AUDIO:
+            self.update_volume()
+        if mask & _DIRTY_BT:
+            self.update_bluetooth_icon()
+        return GLib.SOURCE_REMOVE
+
     def _on_network_property_changed_cb(self, _obj: Any, _pspec: Any):
-        GLib.idle_add(self.update_network_icon)
+        self._schedule_refresh(_DIRTY_NET)
         return GLib.SOURCE_REMOVE
 
     def _on_network_device_ready_cb(self, client: Any, *_extra_args: Any):
-        GLib.idle_add(self.on_network_device_ready, client)
+        self._network_pending_client = client
+        self._schedule_refresh(_DIRTY_NET)
         return GLib.SOURCE_REMOVE
 
     def _speaker_property_changed_cb(self, obj: GObject.Object, pspec: GObject.ParamSpec):
-        GLib.idle_add(self.update_volume)
+        self._schedule_refresh(_DIRTY_AUDIO)
         return True
 
     def _on_speaker_changed_cb(self, _obj: Any, _pspec: Any):
-        GLib.idle_add(self.on_speaker_changed)
+        self._schedule_refresh(_DIRTY_SPEAKER)
         return GLib.SOURCE_REMOVE
 
     def _on_bluetooth_property_changed_cb(self, _obj: Any, _pspec: Any):
-        GLib.idle_add(self.update_bluetooth_icon)
+        self._schedule_refresh(_DIRTY_BT)
         return GLib.SOURCE_REMOVE
 
+    def _defer_until_mapped(self, updater: Callable[..., Any]) -> bool:
+        if self.get_mapped():
+            return False
+        self._deferred_icon_updates.add(updater)
+        return True
+
+    def _on_map_replay_icon_updates(self, *_args: Any):
+        deferred = self._deferred_icon_updates
+        for updater in deferred:
+            GLib.idle_add(updater)
+        deferred.clear()
+
     def update_network_icon(self, *_args: Any):
-        final_icon_name_raw = icons.get("network-offline-symbolic", "network-offline-symbolic")
-        final_icon_name = str(final_icon_name_raw) if final_icon_name_raw is not None else "network-offline-symbolic"
+        if self._defer_until_mapped(self.update_network_icon):
+            return GLib.SOURCE_REMOVE
+
+        final_icon_name = _NET_OFFLINE
 
         if self.network:
             prim_device_type = getattr(self.network, "primary_device", None)
             if prim_device_type == "wifi":
-                wifi_device = getattr(self.network, "wifi_device", None)
-                icon_candidate = None
-                if wifi_device and hasattr(wifi_device, "icon_name") and callable(wifi_device.icon_name):
-                    icon_candidate = wifi_device.icon_name()
-                elif wifi_device and hasattr(wifi_device, "get_property"):
-                    with contextlib.suppress(Exception):
-                        icon_candidate = wifi_device.get_property("icon-name")
-
-                if isinstance(icon_candidate, str) and icon_candidate:
-                    final_icon_name = icon_candidate
-                else:
-                    fallback_raw = icons.get("network", {}).get("wifi", {}).get("disabled", "network-wireless-offline-symbolic")
-                    final_icon_name = str(fallback_raw) if fallback_raw is not None else "network-wireless-offline-symbolic"
+                fetcher = self._wifi_icon_fetcher
+                icon_candidate = fetcher() if fetcher is not None else None
+                final_icon_name = icon_candidate if isinstance(icon_candidate, str) and icon_candidate else _NET_WIFI_DISABLED
 
             elif prim_device_type == "wired":
                 eth_device = getattr(self.network, "ethernet_device", None)
                 icon_candidate = None
-                if eth_device and hasattr(eth_device, "get_property"):
-                    with contextlib.suppress(Exception):
-                        reported_icon = eth_device.get_property("icon-name")
-                        if reported_icon and "unknown" not in str(reported_icon).lower():
-                            icon_candidate = str(reported_icon)
+                if eth_device in self._network_icon_name_devices:
+                    reported_icon = eth_device.get_property("icon-name")
+                    if reported_icon and "unknown" not in str(reported_icon).lower():
+                        icon_candidate = str(reported_icon)
 
-                if isinstance(icon_candidate, str) and icon_candidate:
-                    final_icon_name = icon_candidate
-                else:
-                    fallback_raw = icons.get("network", {}).get("wired-symbolic", "network-wired-symbolic")
-                    final_icon_name = str(fallback_raw) if fallback_raw is not None else "network-wired-symbolic"
+                final_icon_name = icon_candidate if isinstance(icon_candidate, str) and icon_candidate else _NET_WIRED_SYMBOLIC
             else:
-                fallback_raw = icons.get("network", {}).get("wired-no-route-symbolic", "network-offline-symbolic")
-                final_icon_name = str(fallback_raw) if fallback_raw is not None else "network-offline-symbolic"
+                final_icon_name = _NET_WIRED_NO_ROUTE
 
-        self.network_icon.set_from_icon_name(final_icon_name, self.panel_icon_size)
+        self._set_icon(self.network_icon, final_icon_name)
         return GLib.SOURCE_REMOVE
 
     def _is_network_connected(self, _prim: Any, _wi: Any, _eth: Any) -> bool:
-        try:
-            if self.network and hasattr(self.network, "connectivity"):
-                nm_connectivity_full = 4
-                if self.network.connectivity == nm_connectivity_full:
-                    return True
-            active_conn = getattr(self.network, "primary_connection", getattr(self.network, "active_connection", None))
-            if active_conn and hasattr(active_conn, "state"):
-                nm_active_connection_state_activated = 2
-                return active_conn.state == nm_active_connection_state_activated
-        except Exception:
-            pass
-        return False
+        nm_connectivity_full = 4
+        if getattr(self.network, "connectivity", None) == nm_connectivity_full:
+            return True
+        active_conn = getattr(self.network, "primary_connection", getattr(self.network, "active_connection", None))
+        nm_active_connection_state_activated = 2
+        return getattr(active_conn, "state", None) == nm_active_connection_state_activated
 
     def _disconnect_all_network_prop_handlers(self):
-        for obj_with_signal, handler_id in list(self._network_prop_handler_ids):
-            if (
-                obj_with_signal
-                and handler_id is not None
-                and hasattr(obj_with_signal, "handler_is_connected")
-                and obj_with_signal.handler_is_connected(handler_id)
-            ):
-                with contextlib.suppress(Exception):
-                    obj_with_signal.disconnect(handler_id)
-        self._network_prop_handler_ids.clear()
+        handlers = self._network_prop_handler_ids
+        for disconnect, handler_id in handlers:
+            with contextlib.suppress(TypeError, ValueError):
+                disconnect(handler_id)
+        handlers.clear()
+        self._network_icon_name_devices.clear()
+
+    @staticmethod
+    def _resolve_wifi_icon_fetcher(wifi: Any) -> Union[Callable[[], Any], None]:
+        if not wifi:
+            return None
+        icon_name_fn = getattr(wifi, "icon_name", None)
+        if callable(icon_name_fn):
+            return icon_name_fn
+        if "icon-name" in _props_of(wifi):
+            get_property = wifi.get_property
+            return lambda: get_property("icon-name")
+        return None
 
     def on_network_device_ready(self, client: Any):
         self._disconnect_all_network_prop_handlers()
@@ -919,15 +1137,22 @@ class QuickSettingsButtonWidget(ButtonWidget):
             devices_to_monitor.append(wifi)
         if eth:
             devices_to_monitor.append(eth)
-        props_to_watch = ["icon-name", "enabled", "state", "active-access-point", "carrier", "primary-device", "connectivity"]
+        self._wifi_icon_fetcher = self._resolve_wifi_icon_fetcher(wifi)
         for device in devices_to_monitor:
-            if device and hasattr(device, "connect") and hasattr(device, "find_property"):
-                for prop_name in props_to_watch:
-                    if device.find_property(prop_name):
+            if not device:
+                continue
+            props = _props_of(device)
+            connect = getattr(device, "connect", _MISSING)
+            if props and connect is not _MISSING:
+                disconnect = device.disconnect
+                if "icon-name" in props:
+                    self._network_icon_name_devices.add(device)
+                for prop_name in _NET_PROPS_TO_WATCH:
+                    if prop_name in props:
                         with contextlib.suppress(TypeError):
-                            handler_id = device.connect(f"notify::{prop_name}", self._on_network_property_changed_cb)
-                            self._network_prop_handler_ids.append((device, handler_id))
-        GLib.idle_add(self.update_network_icon)
+                            handler_id = connect(f"notify::{prop_name}", self._on_network_property_changed_cb)
+                            self._network_prop_handler_ids.append((disconnect, handler_id))
+        self._schedule_refresh(_DIRTY_NET)
         return GLib.SOURCE_REMOVE
 
     def on_speaker_changed(self, *_args: Any):
@@ -936,88 +1161,78 @@ class QuickSettingsButtonWidget(ButtonWidget):
             self._speaker_mut_h = self._disconnect_handler_id_safe(self._conn_spk_inst, self._speaker_mut_h)
         self._conn_spk_inst = None
 
-        if self.audio and self.audio.speaker and hasattr(self.audio.speaker, "connect"):
-            self._conn_spk_inst = self.audio.speaker
+        speaker = self.audio.speaker if self.audio else None
+        if speaker and getattr(speaker, "connect", _MISSING) is not _MISSING:
+            self._conn_spk_inst = speaker
             speaker_obj = self._conn_spk_inst
+            props = _props_of(speaker_obj)
 
-            if hasattr(speaker_obj, "find_property") and speaker_obj.find_property("volume"):
+            if "volume" in props:
                 self._speaker_vol_h = speaker_obj.connect("notify::volume", self._speaker_property_changed_cb)
 
             mute_prop_name = None
-            if hasattr(speaker_obj, "find_property"):
-                if speaker_obj.find_property("is-muted"):
-                    mute_prop_name = "is-muted"
-                elif speaker_obj.find_property("muted"):
-                    mute_prop_name = "muted"
+            if "is-muted" in props:
+                mute_prop_name = "is-muted"
+            elif "muted" in props:
+                mute_prop_name = "muted"
 
             if mute_prop_name:
                 self._speaker_mut_h = speaker_obj.connect(f"notify::{mute_prop_name}", self._speaker_property_changed_cb)
 
-            GLib.idle_add(self.update_volume)
-        else:
-            GLib.idle_add(self.update_volume)
+        self._schedule_refresh(_DIRTY_AUDIO)
         return GLib.SOURCE_REMOVE
 
     def update_volume(self, *_args: Any):
-        from utils.widget_utils import get_audio_icon_name
+        if self._defer_until_mapped(self.update_volume):
+            return GLib.SOURCE_REMOVE
 
-        key_raw = icons.get("audio", {}).get("volume", {}).get("muted", "audio-volume-muted-symbolic")
-        key = str(key_raw) if key_raw is not None else "audio-volume-muted-symbolic"
-        calc_vol = 0
-        is_muted = True
+        key = _AUDIO_ICON["muted"]
         if self.audio and self.audio.speaker:
             spk = self.audio.speaker
-            if hasattr(spk, "volume"):
-                calc_vol = round(float(spk.volume))
-            mute_val = getattr(spk, "is_muted", getattr(spk, "muted", True))
-            is_muted = bool(mute_val)
-            info = get_audio_icon_name(calc_vol, is_muted)
-            if info and "icon" in info and isinstance(info["icon"], str):
-                key = info["icon"]
-        else:
-            info = get_audio_icon_name(0, True)
-            if info and "icon" in info and isinstance(info["icon"], str):
-                key = info["icon"]
-            else:
-                fallback_raw = icons.get("audio", {}).get("volume", {}).get("muted-fallback", "audio-volume-muted-symbolic")
-                key = str(fallback_raw) if fallback_raw is not None else "audio-volume-muted-symbolic"
-
-        self.audio_icon.set_from_icon_name(key, self.panel_icon_size)
+            spk_volume = getattr(spk, "volume", _MISSING)
+            calc_vol = round(float(spk_volume)) if spk_volume is not _MISSING else 0
+            mute_val = getattr(spk, "is_muted", _MISSING)
+            if mute_val is _MISSING:
+                mute_val = getattr(spk, "muted", True)
+            key = _audio_icon_key(calc_vol, bool(mute_val))
+
+        self._set_icon(self.audio_icon, key)
         return GLib.SOURCE_REMOVE
 
     def update_bluetooth_icon(self, *_args: Any):
-        name_raw = icons.get("bluetooth", {}).get("disabled-symbolic", "bluetooth-disabled-symbolic")
-        name = str(name_raw) if name_raw is not None else "bluetooth-disabled-symbolic"
+        if self._defer_until_mapped(self.update_bluetooth_icon):
+            return GLib.SOURCE_REMOVE
+
+        name = _BT_DISABLED
 
         if self.bluetooth_service and getattr(self.bluetooth_service, "enabled", False):
-            active_raw = icons.get("bluetooth", {}).get("active-symbolic", "bluetooth-active-symbolic")
-            name = str(active_raw) if active_raw is not None else "bluetooth-active-symbolic"
+            name = _BT_ACTIVE
             conn_dev = getattr(self.bluetooth_service, "connected_devices", [])
             if isinstance(conn_dev, (list, tuple)) and len(conn_dev) > 0:
-                connected_raw = icons.get("bluetooth", {}).get("connected-symbolic", name)
-                name = str(connected_raw) if connected_raw is not None else name
-        self.bluetooth_icon.set_from_icon_name(name, self.panel_icon_size)
+                name = _BT_CONNECTED
+        self._set_icon(self.bluetooth_icon, name)
         return GLib.SOURCE_REMOVE
 
+    def _set_icon(self, image: FabricImage, icon_name: str):
+        if self._last_icon_names.get(image) == icon_name:
+            return
+        self._last_icon_names[image] = icon_name
+        image.set_from_icon_name(icon_name, self.panel_icon_size)
+
     def _disconnect_handler_id_safe(self, obj: Any, handler_id: Union[int, None]) -> None:
-        if obj and handler_id is not None and hasattr(obj, "handler_is_connected") and obj.handler_is_connected(handler_id):
-            with contextlib.suppress(Exception):
-                obj.disconnect(handler_id)
+        if obj is None or handler_id is None:
+            return None
+        # Ids are only stored right after connect() and cleared on disconnect, so trust them.
+        with contextlib.suppress(TypeError, ValueError):
+            obj.disconnect(handler_id)
         return None
 
     def _on_destroy(self, *args):
         logger.debug(f"QuickSettingsButtonWidget ({self.get_name()}): Destroying.")
 
-        raw_widget = getattr(self, "_raw_recording_indicator_widget", None)
-        if (
-            raw_widget is not None
-            and hasattr(raw_widget, "stop_play")
-            and hasattr(raw_widget, "get_visible")
-            and callable(raw_widget.get_visible)
-            and raw_widget.get_visible()
-        ):
+        if self._lottie_stop is not None and self._raw_recording_indicator_widget.get_visible():
             with contextlib.suppress(Exception):
-                raw_widget.stop_play()
+                self._lottie_stop()
 
         if self.popup:
             if self._popover_closed_handler_id is not None:
@@ -1054,13 +1269,10 @@ class QuickSettingsButtonWidget(ButtonWidget):
             self._bt_connected_handler_id = self._disconnect_handler_id_safe(self.bluetooth_service, self._bt_connected_handler_id)
             self._bt_devices_handler_id = self._disconnect_handler_id_safe(self.bluetooth_service, self._bt_devices_handler_id)
 
-        if self.recorder_service and self._screen_recorder_bar_signal_id is not None:
-            if hasattr(self.recorder_service, "handler_is_connected") and self.recorder_service.handler_is_connected(
-                self._screen_recorder_bar_signal_id
-            ):
-                with contextlib.suppress(Exception):
-                    self.recorder_service.disconnect(self._screen_recorder_bar_signal_id)
-            self._screen_recorder_bar_signal_id = None
+        if self.recorder_service:
+            self._screen_recorder_bar_signal_id = self._disconnect_handler_id_safe(
+                self.recorder_service, self._screen_recorder_bar_signal_id
+            )
 
         super().destroy()
         logger.debug(f"QuickSettingsButtonWidget ({self.get_name()}): Destroyed.")
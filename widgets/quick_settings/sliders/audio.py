@@ -1,37 +1,115 @@
 import contextlib
+import weakref
 
 import gi
 
 gi.require_version("Gtk", "3.0")
 from fabric.widgets.box import Box
-from gi.repository import GLib, Gtk
+from gi.repository import GLib
 from loguru import logger
 
 from services import audio_service
 from shared import SettingSlider
 from shared.widget_container import HoverButton
 from utils.icons import icons
-from utils.widget_utils import text_icon
+from utils.widget_utils import connect_weak, text_icon
+
+_VOLUME_ICONS = icons.get("audio", {}).get("volume", {})
+_ICON_DISABLED = str(_VOLUME_ICONS.get("disabled", "audio-volume-muted-symbolic"))
+_ICON_MUTED = str(_VOLUME_ICONS.get("muted", "audio-volume-muted-symbolic"))
+_ICON_NONE = str(_VOLUME_ICONS.get("none", "audio-volume-muted-symbolic"))
+_ICON_LOW = str(_VOLUME_ICONS.get("low", "audio-volume-low-symbolic"))
+_ICON_MEDIUM = str(_VOLUME_ICONS.get("medium", "audio-volume-medium-symbolic"))
+_ICON_HIGH = str(_VOLUME_ICONS.get("high", "audio-volume-high-symbolic"))
+_AUDIO_ICON_TABLE = (_ICON_NONE, _ICON_LOW, _ICON_MEDIUM, _ICON_HIGH)
+# Icon bucket per integer volume percent: 0 -> none, 1-33 -> low, 34-66 -> medium, 67-100 -> high.
+_VOL_BUCKETS = bytes([0] * 1 + [1] * 33 + [2] * 33 + [3] * 34)
+_TOOLTIP_CACHE = tuple(f"{i}%" for i in range(101))
+_VOLUME_DEBOUNCE_MS = 40
+# Default-sink renegotiation fires speaker-changed/changed in bursts; rebind once it settles.
+_REINIT_COALESCE_MS = 30
+_idle_add = GLib.idle_add
+# Ahead of GTK's resize/redraw (HIGH_IDLE + 10/+20), so a stream change lands in the very next frame.
+_UPDATE_PRIORITY = GLib.PRIORITY_HIGH_IDLE
+# _last_state marker for the "no usable stream" rendering; never equal to a real (muted, pct, icon) tuple.
+_NO_STREAM_STATE = (None, None, None)
+
+
+def _disconnect_handlers(handlers):
+    # Finalizer for a collected slider; must not reference the slider itself.
+    for sid, obj_ref in handlers.items():
+        obj = obj_ref()
+        if obj is not None:
+            with contextlib.suppress(TypeError, ValueError):
+                obj.disconnect(sid)
+    handlers.clear()
 
 
 class AudioSlider(SettingSlider):
-    def __init__(self, audio_stream=None, show_chevron=True):
+    __slots__ = (
+        "_adj_lower",
+        "_adj_upper",
+        "_adjustment",
+        "_audio_stream_ref",
+        "_client_changed_init_sid",
+        "_client_speaker_changed_sid",
+        "_last_scale_value",
+        "_last_state",
+        "_pending_volume",
+        "_reinit_source_id",
+        "_stream_changed_sid",
+        "_stream_has_muted",
+        "_stream_has_volume",
+        "_submenu_host",
+        "_submenu_host_pinned",
+        "_update_on_map",
+        "_update_source_id",
+        "_vol_debounce_id",
+        "_weak_handlers",
+        "chevron_btn",
+        "chevron_icon",
+        "client",
+        "pixel_size",
+    )
+
+    def __init__(self, audio_stream=None, show_chevron=True, submenu_host=None):
         self.client = audio_service
-        self.audio_stream = audio_stream
+        # Handler id -> weakref to the emitting object, for every signal we hold on the client/stream.
+        self._weak_handlers = {}
+        self._set_audio_stream(audio_stream)
+        # Ancestor owning `audio_submenu`; resolved by walking the tree on first chevron click if not given.
+        self._submenu_host = submenu_host
+        self._submenu_host_pinned = submenu_host is not None
         self.pixel_size = 16
 
         self._client_speaker_changed_sid = None
         self._stream_changed_sid = None
         self._client_changed_init_sid = None
+        self._reinit_source_id = None
+        # Idle source of the queued update_state run; stream "changed" bursts share it.
+        self._update_source_id = None
+        self._update_on_map = False
+        # Latest scale value not yet written to the stream, flushed after _VOLUME_DEBOUNCE_MS.
+        self._pending_volume = None
+        self._vol_debounce_id = None
+        # (muted, rounded volume, icon name) last written to the widgets.
+        self._last_state = None
 
         super().__init__(
-            icon_name=icons.get("audio", {}).get("volume", {}).get("high", "audio-volume-high-symbolic"),
+            icon_name=_ICON_HIGH,
             start_value=0,
             min_value=0,
             max_value=100,
             pixel_size=self.pixel_size,
         )
 
+        # The scale and its 0-100 adjustment live as long as the slider; resolve them once.
+        self._adjustment = self.scale.get_adjustment() if self.scale else None
+        self._adj_lower = int(self._adjustment.get_lower()) if self._adjustment else 0
+        self._adj_upper = int(self._adjustment.get_upper()) if self._adjustment else 100
+        # Integer percent last pushed into the scale; None forces the next update to write it.
+        self._last_scale_value = None
+
         self.chevron_btn = None
         self.chevron_icon = None
         if show_chevron:
@@ -44,19 +122,20 @@ class AudioSlider(SettingSlider):
             if self.client:
                 if self.client.speaker:
                     self._initialize_with_device_stream(self.client.speaker)
-                self._client_speaker_changed_sid = self.client.connect("speaker-changed", self._on_device_stream_changed)
-                self._client_changed_init_sid = self.client.connect("changed", self._init_default_speaker_cb)
+                self._client_speaker_changed_sid = self._connect(self.client, "speaker-changed", self._on_device_stream_changed)
+                self._client_changed_init_sid = self._connect(self.client, "changed", self._init_default_speaker_cb)
             else:
                 logger.warning("AudioSlider: Audio service client not available on init for default speaker.")
         else:
             if self.audio_stream and hasattr(self.audio_stream, "connect"):
-                self._stream_changed_sid = self.audio_stream.connect("changed", self.update_state_idle)
+                self._stream_changed_sid = self._connect(self.audio_stream, "changed", self.update_state_idle)
             else:
                 logger.warning(f"AudioSlider: Provided audio_stream is invalid or non-connectable: {self.audio_stream}")
             self.update_state_idle()
 
         if self.scale:
             self.scale.connect("change-value", self.on_scale_move)
+            self.scale.connect("button-release-event", self._on_scale_release)
         else:
             logger.error("AudioSlider: self.scale is None after super init. This should not happen.")
 
@@ -65,7 +144,21 @@ class AudioSlider(SettingSlider):
         else:
             logger.error("AudioSlider: self.icon_button is None after super init.")
 
+        self.connect("map", self._on_map)
+        self.connect("unrealize", self._on_unrealize)
         self.connect("destroy", self._on_destroy)
+        # Backstop for sliders dropped without ever being destroyed.
+        weakref.finalize(self, _disconnect_handlers, self._weak_handlers).atexit = False
+
+    @property
+    def audio_stream(self):
+        ref = self._audio_stream_ref
+        return ref() if ref is not None else None
+
+    def _connect(self, obj, signal_name, method):
+        sid = connect_weak(obj, signal_name, method)
+        self._weak_handlers[sid] = weakref.ref(obj)
+        return sid
 
     def _init_default_speaker_cb(self, _client=None, _pspec_or_stream=None):
         if self.audio_stream:
@@ -74,134 +167,185 @@ class AudioSlider(SettingSlider):
             return GLib.SOURCE_REMOVE
 
         if self.client and self.client.speaker:
-            self._initialize_with_device_stream(self.client.speaker)
+            self._schedule_reinit()
             self._disconnect_signal(self.client, self._client_changed_init_sid)
             self._client_changed_init_sid = None
-            if not self._client_speaker_changed_sid and self.client:
-                self._client_speaker_changed_sid = self.client.connect("speaker-changed", self._on_device_stream_changed)
+            if self._client_speaker_changed_sid is None:
+                self._client_speaker_changed_sid = self._connect(self.client, "speaker-changed", self._on_device_stream_changed)
         return GLib.SOURCE_REMOVE
 
     def _initialize_with_device_stream(self, stream_obj):
-        if self.audio_stream == stream_obj and self._stream_changed_sid is not None:
+        # Same speaker object: keep the existing "changed" handler and just refresh.
+        if stream_obj is self.audio_stream and self._stream_changed_sid is not None:
             self.update_state_idle()
             return
 
         self._disconnect_signal(self.audio_stream, self._stream_changed_sid)
-        self.audio_stream = stream_obj
+        self._stream_changed_sid = None
+        self._set_audio_stream(stream_obj)
 
         if self.audio_stream and hasattr(self.audio_stream, "connect"):
-            self._stream_changed_sid = self.audio_stream.connect("changed", self.update_state_idle)
+            self._stream_changed_sid = self._connect(self.audio_stream, "changed", self.update_state_idle)
         elif self.audio_stream:
             logger.warning(f"AudioSlider: New stream {self.audio_stream} is not connectable.")
 
         self.update_state_idle()
 
     def _on_device_stream_changed(self, _client=None, _new_stream_ref_or_pspec=None):
-        if self.client and self.client.speaker:
-            new_speaker = self.client.speaker
-            self._initialize_with_device_stream(new_speaker)
-        else:
-            logger.warning("AudioSlider: Default speaker became None.")
-            self._initialize_with_device_stream(None)
+        self._schedule_reinit()
 
-    def _get_icon_name(self):
-        stream_to_check = self.audio_stream
+    def _schedule_reinit(self):
+        if self._reinit_source_id is None:
+            self._reinit_source_id = GLib.timeout_add(_REINIT_COALESCE_MS, self._commit_reinit)
 
-        if not stream_to_check or not hasattr(stream_to_check, "muted") or not hasattr(stream_to_check, "volume"):
-            return str(icons.get("audio", {}).get("volume", {}).get("disabled", "audio-volume-muted-symbolic"))
-
-        if stream_to_check.muted:
-            return str(icons.get("audio", {}).get("volume", {}).get("muted", "audio-volume-muted-symbolic"))
+    def _commit_reinit(self):
+        self._reinit_source_id = None
+        new_speaker = self.client.speaker if self.client else None
+        if new_speaker is None:
+            logger.warning("AudioSlider: Default speaker became None.")
+        self._initialize_with_device_stream(new_speaker)
+        return GLib.SOURCE_REMOVE
 
-        volume = 0
-        with contextlib.suppress(Exception):
-            volume = float(stream_to_check.volume)
+    def _set_audio_stream(self, stream):
+        # Capabilities are fixed per stream object, so probe them once when it is bound.
+        # Only weakly held: the service owns the stream, and a vanished one reads as "no device".
+        self._audio_stream_ref = weakref.ref(stream) if stream is not None else None
+        self._stream_has_volume = bool(stream) and hasattr(stream, "volume")
+        self._stream_has_muted = bool(stream) and hasattr(stream, "muted")
 
-        if volume == 0:
-            return str(icons.get("audio", {}).get("volume", {}).get("none", "audio-volume-muted-symbolic"))
-        elif volume < 34:
-            return str(icons.get("audio", {}).get("volume", {}).get("low", "audio-volume-low-symbolic"))
-        elif volume < 67:
-            return str(icons.get("audio", {}).get("volume", {}).get("medium", "audio-volume-medium-symbolic"))
-        else:
-            return str(icons.get("audio", {}).get("volume", {}).get("high", "audio-volume-high-symbolic"))
+    @staticmethod
+    def _get_icon_name(volume, muted):
+        if muted:
+            return _ICON_MUTED
+        return _AUDIO_ICON_TABLE[_VOL_BUCKETS[min(100, max(0, int(volume)))]]
 
     def update_state_idle(self, *args):
-        GLib.idle_add(self.update_state, priority=GLib.PRIORITY_DEFAULT_IDLE)
+        if self._update_source_id is None:
+            self._update_source_id = _idle_add(self._run_update, priority=_UPDATE_PRIORITY)
         return GLib.SOURCE_REMOVE
 
+    def _run_update(self):
+        self._update_source_id = None
+        return self.update_state()
+
+    def _on_map(self, *_):
+        if self._update_on_map:
+            self._update_on_map = False
+            self.update_state_idle()
+
+    def _on_unrealize(self, *_):
+        # A walked-up host may not be our ancestor once we're re-parented.
+        if not self._submenu_host_pinned:
+            self._submenu_host = None
+
     def update_state(self, *args):
-        if not self.scale or not isinstance(self.scale, Gtk.Widget) or not self.scale.get_realized():
-            logger.debug(f"AudioSlider ({self.get_name()}): Scale widget not valid/realized. Skipping update.")
+        if not self.get_mapped():
+            self._update_on_map = True
             return GLib.SOURCE_REMOVE
 
-        adjustment = self.scale.get_adjustment()
-        if not adjustment or not isinstance(adjustment, Gtk.Adjustment):
-            logger.debug(f"AudioSlider ({self.get_name()}): Gtk.Adjustment not valid. Skipping update.")
+        if not self.scale or not self.scale.get_realized():
+            logger.opt(lazy=True).debug("AudioSlider ({}): Scale widget not valid/realized. Skipping update.", self.get_name)
+            return GLib.SOURCE_REMOVE
+
+        if self._adjustment is None:
+            logger.opt(lazy=True).debug("AudioSlider ({}): Gtk.Adjustment not valid. Skipping update.", self.get_name)
             return GLib.SOURCE_REMOVE
 
         stream_to_update_from = self.audio_stream
 
-        if not stream_to_update_from or not hasattr(stream_to_update_from, "volume") or not hasattr(stream_to_update_from, "muted"):
+        if stream_to_update_from is None or not (self._stream_has_volume and self._stream_has_muted):
+            if self._last_state is _NO_STREAM_STATE:
+                return GLib.SOURCE_REMOVE
+            self._last_state = _NO_STREAM_STATE
             self.scale.set_sensitive(False)
             try:
-                val_to_set = adjustment.get_lower()
-                if not (adjustment.get_lower() <= val_to_set <= adjustment.get_upper()):
-                    val_to_set = 0
-                self.scale.set_value(val_to_set)
+                self.scale.set_value(self._adj_lower)
+                self._last_scale_value = self._adj_lower
             except Exception as e:
                 logger.error(f"AudioSlider: Error setting scale to lower on invalid stream: {e}")
             self.scale.set_tooltip_text("Audio device not available")
             if self.icon and hasattr(self.icon, "set_from_icon_name"):
-                self.icon.set_from_icon_name(self._get_icon_name(), self.pixel_size)
+                self.icon.set_from_icon_name(_ICON_DISABLED, self.pixel_size)
             return GLib.SOURCE_REMOVE
 
         try:
-            volume_raw = stream_to_update_from.volume
-            muted = stream_to_update_from.muted
+            muted = bool(stream_to_update_from.muted)
             volume = 0.0
             with contextlib.suppress(ValueError, TypeError):
-                volume = float(volume_raw)
-
-            self.scale.set_sensitive(not muted)
-
-            current_scale_val = self.scale.get_value()
-            clamped_volume = max(adjustment.get_lower(), min(volume, adjustment.get_upper()))
-
-            if abs(current_scale_val - clamped_volume) > 0.001:
-                self.scale.set_value(clamped_volume)
-
-            self.scale.set_tooltip_text(f"{round(clamped_volume)}%")
-            if self.icon and hasattr(self.icon, "set_from_icon_name"):
-                self.icon.set_from_icon_name(self._get_icon_name(), self.pixel_size)
+                volume = float(stream_to_update_from.volume)
+
+            pct = int(volume + 0.5)
+            if pct < self._adj_lower:
+                pct = self._adj_lower
+            elif pct > self._adj_upper:
+                pct = self._adj_upper
+            # Don't yank the knob back while a drag's value is still waiting to be written.
+            if self._vol_debounce_id is None and pct != self._last_scale_value:
+                self.scale.set_value(pct)
+                self._last_scale_value = pct
+
+            state = (muted, pct, self._get_icon_name(volume, muted))
+            last_state = self._last_state
+            if state == last_state:
+                return GLib.SOURCE_REMOVE
+            self._last_state = state
+
+            if last_state is None or last_state[0] != muted:
+                self.scale.set_sensitive(not muted)
+            if last_state is None or last_state[1] != state[1]:
+                pct = state[1]
+                self.scale.set_tooltip_text(_TOOLTIP_CACHE[pct] if 0 <= pct <= 100 else f"{pct}%")
+            if (last_state is None or last_state[2] != state[2]) and self.icon and hasattr(self.icon, "set_from_icon_name"):
+                self.icon.set_from_icon_name(state[2], self.pixel_size)
         except Exception as e:
             logger.error(f"AudioSlider ({self.get_name()}): Error during update_state: {e}", exc_info=True)
         return GLib.SOURCE_REMOVE
 
     def on_scale_move(self, scale_widget, scroll_type, value):
+        self._pending_volume = value
+        if self._vol_debounce_id is not None:
+            GLib.source_remove(self._vol_debounce_id)
+        self._vol_debounce_id = GLib.timeout_add(_VOLUME_DEBOUNCE_MS, self._flush_volume)
+        return False
+
+    def _on_scale_release(self, *_):
+        if self._vol_debounce_id is not None:
+            GLib.source_remove(self._vol_debounce_id)
+            self._flush_volume()
+        return False
+
+    def _flush_volume(self):
+        self._vol_debounce_id = None
+        value = self._pending_volume
+        self._pending_volume = None
+        # The knob now sits wherever the user left it; resync it from whatever the stream reports next.
+        self._last_scale_value = None
         target_stream = self.audio_stream
 
-        if target_stream and hasattr(target_stream, "volume"):
+        if value is not None and target_stream is not None and self._stream_has_volume:
             try:
                 target_stream.volume = float(value)
             except Exception as e:
                 logger.error(f"AudioSlider: Error setting volume on stream: {e}", exc_info=True)
-        return False
+        return GLib.SOURCE_REMOVE
 
     def on_chevron_click(self, button_widget):
-        parent = self.get_parent()
-        while parent and not hasattr(parent, "audio_submenu"):
-            parent = parent.get_parent()
-
+        host = self._submenu_host
+        if host is None:
+            host = self.get_parent()
+            while host is not None and getattr(host, "audio_submenu", None) is None:
+                host = host.get_parent()
+            self._submenu_host = host
+
+        audio_submenu = getattr(host, "audio_submenu", None)
         if (
-            parent
-            and hasattr(parent, "audio_submenu")
-            and hasattr(parent.audio_submenu, "toggle_reveal")
+            audio_submenu is not None
+            and hasattr(audio_submenu, "toggle_reveal")
             and self.chevron_icon
             and hasattr(self.chevron_icon, "set_label")
         ):
             try:
-                is_visible = parent.audio_submenu.toggle_reveal()
+                is_visible = audio_submenu.toggle_reveal()
                 self.chevron_icon.set_label("" if is_visible else "")
             except Exception as e:
                 logger.error(f"AudioSlider: Error toggling audio_submenu: {e}", exc_info=True)
@@ -212,7 +356,7 @@ class AudioSlider(SettingSlider):
 
     def on_mute_click(self, button_widget):
         target_stream = self.audio_stream
-        if target_stream and hasattr(target_stream, "muted"):
+        if target_stream is not None and self._stream_has_muted:
             try:
                 new_mute_state = not target_stream.muted
                 target_stream.muted = new_mute_state
@@ -220,6 +364,8 @@ class AudioSlider(SettingSlider):
                 logger.error(f"AudioSlider: Error toggling mute on stream: {e}", exc_info=True)
 
     def _disconnect_signal(self, obj, sid):
+        if sid is not None:
+            self._weak_handlers.pop(sid, None)
         if obj and sid is not None and hasattr(obj, "handler_is_connected") and obj.handler_is_connected(sid):
             with contextlib.suppress(Exception):
                 obj.disconnect(sid)
@@ -227,6 +373,19 @@ class AudioSlider(SettingSlider):
         return False
 
     def _on_destroy(self, *args):
+        self.disconnect_all()
+
+    def disconnect_all(self):
+        if self._reinit_source_id is not None:
+            GLib.source_remove(self._reinit_source_id)
+            self._reinit_source_id = None
+        if self._update_source_id is not None:
+            GLib.source_remove(self._update_source_id)
+            self._update_source_id = None
+        if self._vol_debounce_id is not None:
+            GLib.source_remove(self._vol_debounce_id)
+            self._vol_debounce_id = None
+
         if self.client:
             self._disconnect_signal(self.client, self._client_speaker_changed_sid)
             self._disconnect_signal(self.client, self._client_changed_init_sid)
@@ -236,4 +395,4 @@ class AudioSlider(SettingSlider):
         self._client_speaker_changed_sid = None
         self._client_changed_init_sid = None
         self._stream_changed_sid = None
-        self.audio_stream = None
+        self._set_audio_stream(None)
@@ -1,5 +1,5 @@
 import os
-import subprocess
+import socket
 import shutil
 from gi.repository import Gtk, GLib
 
@@ -9,12 +9,30 @@ from shared import SettingSlider, HoverButton
 # import utils.functions as helpers # Not needed in this version
 # from utils.widget_utils import util_fabricator # No longer needed
 
+
+def _hyprsunset_socket_path():
+    """Control socket of a running hyprsunset (same one `hyprctl hyprsunset ...` talks to)."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not runtime_dir or not signature: return None
+    return os.path.join(runtime_dir, "hypr", signature, ".hyprsunset.sock")
+
+
+_HYPRSUNSET_SOCKET = _hyprsunset_socket_path()
+
+
+def _build_scale_to_kelvin(kelvin_min, kelvin_max, scale_min, scale_max):
+    """Kelvin for every integer scale step, INVERTED (scale_min -> kelvin_max)."""
+    per_step = (kelvin_max - kelvin_min) / (scale_max - scale_min)
+    return tuple(int(kelvin_max - step * per_step) for step in range(scale_max - scale_min + 1))
+
+
 class HyprSunsetIntensitySlider(SettingSlider):
     """
     A slider widget to control screen color temperature using hyprsunset.
     Maps a 0-100 visual scale (representing filter intensity) to an
     INVERTED 2000K-6500K range (0=Neutral, 100=Warmest).
-    Uses subprocess to kill existing instances and start new ones.
+    Talks to a running hyprsunset over IPC, falling back to kill-and-restart.
     Updates UI optimistically based on user actions.
     """
     # Define Kelvin range constants
@@ -27,6 +45,11 @@ class HyprSunsetIntensitySlider(SettingSlider):
     SCALE_MIN = 0
     SCALE_MAX = 100
 
+    # Kelvin covered by one visual scale step (45K for 4500K over 0-100)
+    _KELVIN_PER_STEP = (KELVIN_MAX - KELVIN_MIN) / (SCALE_MAX - SCALE_MIN)
+    # The scale moves in whole steps (increments 1/5), so scale -> Kelvin is a 101-entry table read
+    _SCALE_TO_K = _build_scale_to_kelvin(KELVIN_MIN, KELVIN_MAX, SCALE_MIN, SCALE_MAX)
+
     def __init__(self, **kwargs):
         icon_name = "weather-clear-night-symbolic" # Icon representing warmth/night
 
@@ -44,8 +67,8 @@ class HyprSunsetIntensitySlider(SettingSlider):
         )
 
         # Configure the scale provided by SettingSlider
-        initial_tooltip_kelvin = self._scale_to_kelvin(initial_scale_value) # Get initial K for tooltip
-        self.scale.set_tooltip_text(f"Screen Color Temperature ({initial_tooltip_kelvin}K)")
+        # Matches what update_state renders for the initial KELVIN_DEFAULT state, so no extra sync is needed
+        self.scale.set_tooltip_text(f"Screen Color Temperature ({self.KELVIN_DEFAULT}K)")
         self.scale.set_increments(1, 5) # Step/Page increments for the 0-100 visual scale
 
         # Add the "Neutral" button (sets intensity to 0%, Kelvin to KELVIN_NEUTRAL)
@@ -59,61 +82,105 @@ class HyprSunsetIntensitySlider(SettingSlider):
         self._current_known_state = {"type": "kelvin", "value": self.KELVIN_DEFAULT}
         self._is_updating_state_prevent_feedback = False
         self._debounce_timer_id = None
+        self._pending_restart = None # (args, on_success) for the kill-and-restart fallback in flight
         self.DEBOUNCE_INTERVAL = 350 # Milliseconds
 
+        # Resolve the binaries once instead of walking $PATH on every commit
+        self._pkill_path = shutil.which("pkill")
+        self._hyprsunset_path = shutil.which("hyprsunset")
+        if not self._hyprsunset_path:
+            print("ERROR: Cannot find 'hyprsunset'. Disabling the slider.")
+            self.scale.set_sensitive(False)
+            self.neutral_button.set_sensitive(False)
+
         # Connect signals
-        self.scale.connect("value-changed", self._on_scale_value_changed_by_user_debounced)
+        self._scale_value_changed_id = self.scale.connect("value-changed", self._on_scale_value_changed_by_user_debounced)
         self.neutral_button.connect("clicked", self._on_set_identity_clicked)
 
-        # Initial UI sync
-        GLib.idle_add(self.update_state)
         print("DEBUG: HyprSunsetIntensitySlider (Cleaned, Subprocess, INVERTED) initialized.")
 
     # --- INVERTED MAPPING LOGIC ---
     def _scale_to_kelvin(self, scale_value):
         """Maps a 0-100 intensity scale value to the INVERTED KELVIN_MIN-KELVIN_MAX range."""
-        if self.SCALE_MAX == self.SCALE_MIN: return self.KELVIN_MAX
-        scale_value = max(self.SCALE_MIN, min(self.SCALE_MAX, scale_value))
-        percentage = float(scale_value - self.SCALE_MIN) / (self.SCALE_MAX - self.SCALE_MIN)
         # Inverted mapping: 0% intensity -> KELVIN_MAX, 100% intensity -> KELVIN_MIN
-        kelvin = self.KELVIN_MAX - percentage * (self.KELVIN_MAX - self.KELVIN_MIN)
-        return int(kelvin)
+        step = int(scale_value) - self.SCALE_MIN
+        if step < 0: step = 0
+        elif step > self.SCALE_MAX - self.SCALE_MIN: step = self.SCALE_MAX - self.SCALE_MIN
+        return self._SCALE_TO_K[step]
 
     def _kelvin_to_scale(self, kelvin_value):
         """Maps a KELVIN_MIN-KELVIN_MAX value to the INVERTED 0-100 intensity scale range."""
-        if self.KELVIN_MAX == self.KELVIN_MIN: return self.SCALE_MIN
-        kelvin_value = max(self.KELVIN_MIN, min(self.KELVIN_MAX, kelvin_value))
         # Inverted mapping: KELVIN_MAX -> 0%, KELVIN_MIN -> 100%
-        percentage_from_max = (float(self.KELVIN_MAX - kelvin_value)) / (self.KELVIN_MAX - self.KELVIN_MIN)
-        scale_val = self.SCALE_MIN + percentage_from_max * (self.SCALE_MAX - self.SCALE_MIN)
-        return int(scale_val)
+        if kelvin_value < self.KELVIN_MIN: kelvin_value = self.KELVIN_MIN
+        elif kelvin_value > self.KELVIN_MAX: kelvin_value = self.KELVIN_MAX
+        return int(self.SCALE_MIN + (self.KELVIN_MAX - kelvin_value) / self._KELVIN_PER_STEP)
     # --- END OF INVERTED MAPPING LOGIC ---
 
+    def _send_hyprsunset_ipc(self, command: str) -> bool:
+        """Sends a command to the already running hyprsunset; False if nothing is listening."""
+        if not _HYPRSUNSET_SOCKET or not os.path.exists(_HYPRSUNSET_SOCKET): return False
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.2)
+                sock.connect(_HYPRSUNSET_SOCKET)
+                sock.sendall(command.encode())
+                reply = sock.recv(64)
+        except OSError as e:
+            print(f"hyprsunset IPC '{command}' failed, falling back to restart: {e}")
+            return False
+        return not reply.lower().startswith(b"invalid")
+
+    def _apply_hyprsunset(self, ipc_command: str, hyprsunset_args_list, command_desc: str,
+                          success_callback_optimistic=None):
+        """Retunes the running hyprsunset over IPC, only restarting it when that isn't possible."""
+        if self._send_hyprsunset_ipc(ipc_command):
+            if success_callback_optimistic: success_callback_optimistic()
+            return
+        self._execute_kill_then_hyprsunset_change(hyprsunset_args_list, command_desc, success_callback_optimistic)
+
     def _execute_kill_then_hyprsunset_change(self, hyprsunset_args_list, command_desc: str,
                                              success_callback_optimistic=None):
-        """Uses subprocess to run kill then start hyprsunset asynchronously."""
-        pkill_path = shutil.which("pkill")
-        hyprsunset_path = shutil.which("hyprsunset")
+        """Spawns pkill, then starts hyprsunset once pkill has exited; never blocks the main loop."""
+        pkill_path = self._pkill_path
+        hyprsunset_path = self._hyprsunset_path
 
         if not pkill_path: print("ERROR: Cannot find 'pkill'."); return
         if not hyprsunset_path: print("ERROR: Cannot find 'hyprsunset'."); return
 
+        # Only the newest request matters; a pkill already in flight will start hyprsunset with it
+        restart_in_flight = self._pending_restart is not None
+        self._pending_restart = (hyprsunset_args_list, success_callback_optimistic)
+        if restart_in_flight:
+            print(f"Restart already in progress, '{command_desc}' will be applied when it finishes.")
+            return
+
         print(f"Initiating sequence for '{command_desc}'...")
-        try:
-            kill_process = subprocess.run([pkill_path, "hyprsunset"], timeout=0.5, check=False)
-        except Exception as e: print(f"ERROR running pkill: {e}")
 
-        delay_ms = 200
-        def start_hyprsunset_after_delay():
+        def start_hyprsunset():
+            args_list, on_success = self._pending_restart
+            self._pending_restart = None
             try:
-                process = subprocess.Popen(
-                    [hyprsunset_path] + hyprsunset_args_list,
-                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                GLib.spawn_async(
+                    [hyprsunset_path, *args_list],
+                    flags=GLib.SpawnFlags.STDOUT_TO_DEV_NULL | GLib.SpawnFlags.STDERR_TO_DEV_NULL
                 )
-                if success_callback_optimistic: success_callback_optimistic()
-            except Exception as e: print(f"ERROR launching hyprsunset: {e}")
-            return GLib.SOURCE_REMOVE
-        GLib.timeout_add(delay_ms, start_hyprsunset_after_delay)
+                if on_success: on_success()
+            except GLib.Error as e: print(f"ERROR launching hyprsunset: {e}")
+
+        def on_pkill_exited(pid, _status):
+            GLib.spawn_close_pid(pid)
+            start_hyprsunset()
+
+        try:
+            pid, *_ = GLib.spawn_async(
+                [pkill_path, "hyprsunset"],
+                flags=GLib.SpawnFlags.DO_NOT_REAP_CHILD | GLib.SpawnFlags.STDOUT_TO_DEV_NULL | GLib.SpawnFlags.STDERR_TO_DEV_NULL
+            )
+        except GLib.Error as e:
+            print(f"ERROR running pkill: {e}")
+            start_hyprsunset()
+            return
+        GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid, on_pkill_exited)
 
     def _on_scale_value_changed_by_user_debounced(self, scale_widget, new_scale_value=None):
         """Handles raw 'value-changed' from scale and debounces command execution."""
@@ -139,33 +206,34 @@ class HyprSunsetIntensitySlider(SettingSlider):
             return GLib.SOURCE_REMOVE # Value already set
 
         command_desc = f"Set HyprSunset to {kelvin_value}K"
-        def on_success_optimistic():
-            self._current_known_state = {"type": "kelvin", "value": kelvin_value}
-            print(f"State updated optimistically for {command_desc}")
-
-        self._execute_kill_then_hyprsunset_change(
+        self._apply_hyprsunset(
+            f"temperature {kelvin_value}",
             ["-t", f"{kelvin_value}k"], # Send actual mapped Kelvin
             command_desc,
-            on_success_optimistic
+            lambda: self._commit_and_refresh({"type": "kelvin", "value": kelvin_value}, command_desc)
         )
         return GLib.SOURCE_REMOVE
 
     def _on_set_identity_clicked(self, *args):
         """Handles click on the 'Neutral' button."""
-        command_desc = f"Set HyprSunset to identity (neutral)"
-        def on_success_optimistic():
-            self._current_known_state = {"type": "identity"}
-            self.update_state() # Sync UI to neutral state
-            print(f"State updated optimistically for {command_desc}")
-
-        # Use the kill-then-start strategy with the '-i' flag
-        self._execute_kill_then_hyprsunset_change(
+        command_desc = "Set HyprSunset to identity (neutral)"
+        # IPC 'identity', or kill-then-start with the '-i' flag if hyprsunset isn't listening
+        self._apply_hyprsunset(
+            "identity",
             ["-i"],
             command_desc,
-            on_success_optimistic
+            lambda: self._commit_and_refresh({"type": "identity"}, command_desc)
         )
 
-    def update_state(self, *args):
+    def _commit_and_refresh(self, new_state, command_desc: str):
+        """Single tail for every successful command: record the optimistic state and sync the UI once."""
+        self._current_known_state = new_state
+        # A newer knob position is still being debounced/applied; snapping the scale back to this
+        # older value would lose it, so only the tooltip follows the committed state then
+        self.update_state(sync_scale=not (self._debounce_timer_id is not None or self._pending_restart is not None))
+        print(f"State updated optimistically for {command_desc}")
+
+    def update_state(self, *args, sync_scale=True):
         """Updates the slider's visual state based *only* on _current_known_state."""
         if self._is_updating_state_prevent_feedback: return GLib.SOURCE_REMOVE
         self._is_updating_state_prevent_feedback = True
@@ -193,8 +261,11 @@ class HyprSunsetIntensitySlider(SettingSlider):
              if adj and isinstance(adj, Gtk.Adjustment): current_visual_scale_val = int(adj.get_value())
         except Exception as e: print(f"ERROR getting scale value in update_state: {e}")
 
-        if current_visual_scale_val is not None and current_visual_scale_val != target_scale_value:
+        if sync_scale and current_visual_scale_val is not None and current_visual_scale_val != target_scale_value:
+            # Programmatic sync must not bounce back into the debounced command path
+            self.scale.handler_block(self._scale_value_changed_id)
             self.scale.set_value(target_scale_value)
+            self.scale.handler_unblock(self._scale_value_changed_id)
 
         self.scale.set_tooltip_text(tooltip_text)
         # print(f"HyprSunsetSlider state synced: {self._current_known_state} (Visual Scale: {target_scale_value}%)")
@@ -1,52 +1,82 @@
 import gi
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GLib
+from gi.repository import GLib
 from loguru import logger
 import contextlib
 
-from fabric.widgets.box import Box
 from shared import SettingSlider
 from shared.widget_container import HoverButton
 
 from services import audio_service
 from utils.icons import icons
-from utils.widget_utils import text_icon
+from utils.widget_utils import connect_object, text_icon
+
+_MIC_ICONS = icons.get("audio", {}).get("mic", {})
+_ICON_DISABLED = str(_MIC_ICONS.get("disabled", "audio-input-microphone-muted-symbolic"))
+_ICON_MUTED = str(_MIC_ICONS.get("muted", "audio-input-microphone-muted-symbolic"))
+_ICON_MEDIUM = str(_MIC_ICONS.get("medium", "audio-input-microphone-symbolic"))
+# At most one stream write per window while dragging; the latest value always lands.
+_VOLUME_FLUSH_MS = 50
+# microphone-changed arrives in bursts while PulseAudio renegotiates; bind only once it goes quiet.
+_MIC_CHANGE_SETTLE_MS = 150
+_CHEVRON_COLLAPSED = ""
+_CHEVRON_EXPANDED = ""
 
 
 class MicrophoneSlider(SettingSlider):
     def __init__(self, audio_stream=None, show_chevron=True):
         self.client = audio_service
-        self.audio_stream = audio_stream
+        self._set_audio_stream(audio_stream)
         self.pixel_size = 16
 
-        self._client_mic_changed_sid = None
         self._stream_changed_sid = None
         self._client_changed_init_sid = None
+        self._mic_change_sid = None
         self._is_default_device_controller = audio_stream is None
+        # Idle source of the queued update_state run; stream "changed" bursts share it.
+        self._pending_update_sid = None
+        # Set when a refresh was skipped while the panel was hidden; replayed on the next map.
+        self._update_on_map = False
+        # Last values pushed into the widgets; setters are skipped when nothing changed.
+        self._last_sensitive = None
+        self._last_tooltip = None
+        self._last_icon_name = None
+        # Rounded percent behind the current tooltip; -1 when it shows something else.
+        self._last_tooltip_pct = -1
+        # Latest scale value not yet written to the stream, flushed after _VOLUME_FLUSH_MS.
+        self._pending_volume = None
+        self._volume_flush_sid = None
 
         super().__init__(
-            icon_name=icons.get("audio", {}).get("mic", {}).get("medium", "audio-input-microphone-symbolic"),
+            icon_name=_ICON_MEDIUM,
             start_value=0,
             min_value=0,
             max_value=100,
             pixel_size=self.pixel_size,
         )
 
+        # The scale and its 0-100 adjustment live as long as the slider; resolve them once.
+        self._adjustment = self.scale.get_adjustment() if self.scale else None
+        self._adj_lower = self._adjustment.get_lower() if self._adjustment else 0.0
+        self._adj_upper = self._adjustment.get_upper() if self._adjustment else 100.0
+
         self.chevron_btn = None
         self.chevron_icon = None
-        if show_chevron:
-            self.chevron_icon = text_icon(icon="", props={"style": "font-size:12px;"})
-            self.chevron_btn = HoverButton(child=Box(children=(self.chevron_icon,)))
-            self.chevron_btn.connect("clicked", self.on_chevron_click)
-            self.pack_end(self.chevron_btn, False, False, 0)
+        # The chevron only matters once the panel is actually shown; build it on first map.
+        self._chevron_map_sid = self.connect("map", self._build_chevron) if show_chevron else None
+        self._chevron_expanded = False
+        # Ancestor owning `mic_submenu`, found on the first chevron click.
+        self._submenu_owner = None
 
         if self._is_default_device_controller:
             if self.client:
+                connect_object(self.client, "microphone-changed", self._on_device_mic_changed)
                 if self.client.microphone:
                     self._initialize_with_device_stream(self.client.microphone)
-                self._client_mic_changed_sid = self.client.connect("microphone-changed", self._on_device_mic_changed)
-                self._client_changed_init_sid = self.client.connect("changed", self._init_default_mic_cb)
+                else:
+                    # Only needed to catch the first microphone; _init_default_mic_cb drops it.
+                    self._client_changed_init_sid = connect_object(self.client, "changed", self._init_default_mic_cb)
             else:
                 logger.warning("MicrophoneSlider: Audio service client not available for default mic.")
         else:
@@ -66,8 +96,26 @@ class MicrophoneSlider(SettingSlider):
         else:
             logger.error("MicrophoneSlider: self.icon_button is None after super init.")
 
+        self.connect("map", self._on_map)
+        self.connect("parent-set", self._on_parent_set)
         self.connect("destroy", self._on_destroy)
 
+    def _build_chevron(self, *_):
+        self.disconnect(self._chevron_map_sid)
+        self._chevron_map_sid = None
+        self.chevron_icon = text_icon(icon=_CHEVRON_COLLAPSED, props={"style": "font-size:12px;"})
+        self.chevron_btn = HoverButton(child=self.chevron_icon)
+        self.chevron_btn.connect("clicked", self.on_chevron_click)
+        self.pack_end(self.chevron_btn, False, False, 0)
+
+    def _on_map(self, *_):
+        if self._update_on_map:
+            self._update_on_map = False
+            self.update_state_idle()
+
+    def _on_parent_set(self, *_):
+        self._submenu_owner = None
+
     def _init_default_mic_cb(self, _client=None, _pspec_or_stream=None):
         if not self._is_default_device_controller or self.audio_stream:
             self._disconnect_signal(self.client, self._client_changed_init_sid)
@@ -78,8 +126,6 @@ class MicrophoneSlider(SettingSlider):
             self._initialize_with_device_stream(self.client.microphone)
             self._disconnect_signal(self.client, self._client_changed_init_sid)
             self._client_changed_init_sid = None
-            if not self._client_mic_changed_sid and self.client:
-                self._client_mic_changed_sid = self.client.connect("microphone-changed", self._on_device_mic_changed)
         return GLib.SOURCE_REMOVE
 
     def _initialize_with_device_stream(self, stream_obj):
@@ -87,8 +133,8 @@ class MicrophoneSlider(SettingSlider):
             self.update_state_idle()
             return
 
-        self._disconnect_signal(self.audio_stream, self._stream_changed_sid)
-        self.audio_stream = stream_obj
+        self._disconnect_stream()
+        self._set_audio_stream(stream_obj)
 
         if self.audio_stream and hasattr(self.audio_stream, "connect"):
             self._stream_changed_sid = self.audio_stream.connect("changed", self.update_state_idle)
@@ -99,119 +145,148 @@ class MicrophoneSlider(SettingSlider):
 
     def _on_device_mic_changed(self, _client=None, _new_stream_ref_or_pspec=None):
         if self._is_default_device_controller:
-            if self.client and self.client.microphone:
-                new_mic = self.client.microphone
-                self._initialize_with_device_stream(new_mic)
-            else:
-                logger.warning("MicrophoneSlider: Default microphone became None.")
-                self._initialize_with_device_stream(None)
-
-    def _get_icon_name(self):
-        stream_to_check = self.audio_stream
-        if self._is_default_device_controller:
-            stream_to_check = self.client.microphone if self.client and self.client.microphone else None
+            if self._mic_change_sid is not None:
+                GLib.source_remove(self._mic_change_sid)
+            self._mic_change_sid = GLib.timeout_add(_MIC_CHANGE_SETTLE_MS, self._apply_mic_change)
 
-        if not stream_to_check or not hasattr(stream_to_check, "muted") or not hasattr(stream_to_check, "volume"):
-            return str(icons.get("audio", {}).get("mic", {}).get("disabled", "audio-input-microphone-muted-symbolic"))
+    def _apply_mic_change(self):
+        self._mic_change_sid = None
+        if self.client and self.client.microphone:
+            self._initialize_with_device_stream(self.client.microphone)
+        else:
+            logger.warning("MicrophoneSlider: Default microphone became None.")
+            self._initialize_with_device_stream(None)
+        return GLib.SOURCE_REMOVE
 
-        if stream_to_check.muted:
-            return str(icons.get("audio", {}).get("mic", {}).get("muted", "audio-input-microphone-muted-symbolic"))
+    def _set_audio_stream(self, stream):
+        # The bound stream is the one every hot path acts on; for the default-device slider
+        # it tracks client.microphone via microphone-changed.
+        # Capabilities are fixed per stream object, so probe them once when it is bound.
+        self.audio_stream = stream
+        self._stream_has_volume = bool(stream) and hasattr(stream, "volume")
+        self._stream_has_muted = bool(stream) and hasattr(stream, "muted")
 
-        return str(icons.get("audio", {}).get("mic", {}).get("medium", "audio-input-microphone-symbolic"))
+    @staticmethod
+    def _get_icon_name(muted):
+        return _ICON_MUTED if muted else _ICON_MEDIUM
 
     def update_state_idle(self, *args):
-        GLib.idle_add(self.update_state, priority=GLib.PRIORITY_DEFAULT_IDLE)
+        if not self.get_mapped():
+            self._update_on_map = True
+            return GLib.SOURCE_REMOVE
+        if self._pending_update_sid is None:
+            self._pending_update_sid = GLib.idle_add(self._run_update, priority=GLib.PRIORITY_DEFAULT_IDLE)
         return GLib.SOURCE_REMOVE
 
+    def _run_update(self):
+        self._pending_update_sid = None
+        return self.update_state()
+
     def update_state(self, *args):
-        if not self.scale or not isinstance(self.scale, Gtk.Widget) or not self.scale.get_realized():
-            logger.debug(f"MicrophoneSlider ({self.get_name()}): Scale not valid/realized. Skipping update.")
+        if not self.scale or not self.scale.get_realized():
+            logger.opt(lazy=True).debug("MicrophoneSlider ({}): Scale not valid/realized. Skipping update.", self.get_name)
             return GLib.SOURCE_REMOVE
 
-        adjustment = self.scale.get_adjustment()
-        if not adjustment or not isinstance(adjustment, Gtk.Adjustment):
-            logger.debug(f"MicrophoneSlider ({self.get_name()}): Adjustment not valid. Skipping update.")
+        if self._adjustment is None:
+            logger.opt(lazy=True).debug("MicrophoneSlider ({}): Adjustment not valid. Skipping update.", self.get_name)
             return GLib.SOURCE_REMOVE
 
         stream_to_update_from = self.audio_stream
-        if self._is_default_device_controller:
-            stream_to_update_from = self.client.microphone if self.client and self.client.microphone else None
 
-        if not stream_to_update_from or not hasattr(stream_to_update_from, "volume") or not hasattr(stream_to_update_from, "muted"):
-            self.scale.set_sensitive(False)
+        if not stream_to_update_from or not (self._stream_has_volume and self._stream_has_muted):
+            self._set_sensitive(False)
             try:
-                val_to_set = adjustment.get_lower()
-                if not (adjustment.get_lower() <= val_to_set <= adjustment.get_upper()):
-                    val_to_set = 0
-                self.scale.set_value(val_to_set)
+                self.scale.set_value(self._adj_lower)
             except Exception as e:
                 logger.error(f"MicrophoneSlider: Error setting scale to lower on invalid stream: {e}")
-            self.scale.set_tooltip_text("Microphone not available")
-            if self.icon and hasattr(self.icon, "set_from_icon_name"):
-                self.icon.set_from_icon_name(self._get_icon_name(), self.pixel_size)
+            self._set_tooltip("Microphone not available")
+            self._last_tooltip_pct = -1
+            self._set_icon_name(_ICON_DISABLED)
             return GLib.SOURCE_REMOVE
 
         try:
             volume_raw = stream_to_update_from.volume
-            muted = stream_to_update_from.muted
+            muted = bool(stream_to_update_from.muted)
             volume = 0.0
             with contextlib.suppress(ValueError, TypeError):
                 volume = float(volume_raw)
 
-            self.scale.set_sensitive(not muted)
-            current_scale_val = self.scale.get_value()
-            clamped_volume = max(adjustment.get_lower(), min(volume, adjustment.get_upper()))
+            self._set_sensitive(not muted)
+            clamped_volume = self._adj_upper if volume > self._adj_upper else (self._adj_lower if volume < self._adj_lower else volume)
 
-            if abs(current_scale_val - clamped_volume) > 0.001:
+            # GtkAdjustment already ignores a set_value to its current value.
+            # Don't yank the knob back while a drag's value is still waiting to be written.
+            if self._volume_flush_sid is None:
                 self.scale.set_value(clamped_volume)
 
-            self.scale.set_tooltip_text(f"{round(clamped_volume)}%")
-            if self.icon and hasattr(self.icon, "set_from_icon_name"):
-                self.icon.set_from_icon_name(self._get_icon_name(), self.pixel_size)
+            pct = round(clamped_volume)
+            if pct != self._last_tooltip_pct:
+                self._set_tooltip(f"{pct}%")
+                self._last_tooltip_pct = pct
+            self._set_icon_name(self._get_icon_name(muted))
         except Exception as e:
             logger.error(f"MicrophoneSlider ({self.get_name()}): Error during update_state: {e}", exc_info=True)
         return GLib.SOURCE_REMOVE
 
+    def _set_sensitive(self, sensitive):
+        if sensitive != self._last_sensitive:
+            self.scale.set_sensitive(sensitive)
+            self._last_sensitive = sensitive
+
+    def _set_tooltip(self, text):
+        if text != self._last_tooltip:
+            self.scale.set_tooltip_text(text)
+            self._last_tooltip = text
+
+    def _set_icon_name(self, icon_name):
+        if icon_name != self._last_icon_name:
+            self.icon.set_from_icon_name(icon_name, self.pixel_size)
+            self._last_icon_name = icon_name
+
     def on_scale_move(self, scale_widget, scroll_type, value):
+        self._pending_volume = value
+        if self._volume_flush_sid is None:
+            self._volume_flush_sid = GLib.timeout_add(_VOLUME_FLUSH_MS, self._flush_volume)
+        return False
+
+    def _flush_volume(self):
+        self._volume_flush_sid = None
+        value = self._pending_volume
+        self._pending_volume = None
         target_stream = self.audio_stream
-        if self._is_default_device_controller:
-            target_stream = self.client.microphone if self.client and self.client.microphone else None
 
-        if target_stream and hasattr(target_stream, "volume"):
+        if value is not None and target_stream and self._stream_has_volume:
             try:
                 target_stream.volume = float(value)
             except Exception as e:
                 logger.error(f"MicrophoneSlider: Error setting volume: {e}", exc_info=True)
-        return False
+        return GLib.SOURCE_REMOVE
 
     def on_chevron_click(self, button_widget):
-        parent = self.get_parent()
-        while parent and not hasattr(parent, "mic_submenu"):
-            parent = parent.get_parent()
-
-        if (
-            parent
-            and hasattr(parent, "mic_submenu")
-            and hasattr(parent.mic_submenu, "toggle_reveal")
-            and self.chevron_icon
-            and hasattr(self.chevron_icon, "set_label")
-        ):
+        parent = self._submenu_owner
+        if parent is None:
+            parent = self.get_parent()
+            while parent and not hasattr(parent, "mic_submenu"):
+                parent = parent.get_parent()
+            self._submenu_owner = parent
+
+        if parent and hasattr(parent, "mic_submenu") and hasattr(parent.mic_submenu, "toggle_reveal") and self.chevron_icon:
             try:
-                is_visible = parent.mic_submenu.toggle_reveal()
-                self.chevron_icon.set_label("" if is_visible else "")
+                is_visible = bool(parent.mic_submenu.toggle_reveal())
+                if is_visible != self._chevron_expanded:
+                    self._chevron_expanded = is_visible
+                    self.chevron_icon.set_label(_CHEVRON_EXPANDED if is_visible else _CHEVRON_COLLAPSED)
             except Exception as e:
                 logger.error(f"MicrophoneSlider: Error toggling mic_submenu: {e}", exc_info=True)
-        elif not (self.chevron_icon and hasattr(self.chevron_icon, "set_label")):
+        elif not self.chevron_icon:
             logger.warning("MicrophoneSlider: Chevron icon not available for label update.")
         else:
             logger.warning("MicrophoneSlider: Could not find mic_submenu or toggle_reveal method on parent.")
 
     def on_mute_click(self, button_widget):
         target_stream = self.audio_stream
-        if self._is_default_device_controller:
-            target_stream = self.client.microphone if self.client and self.client.microphone else None
 
-        if target_stream and hasattr(target_stream, "muted"):
+        if target_stream and self._stream_has_muted:
             try:
                 new_mute_state = not target_stream.muted
                 target_stream.muted = new_mute_state
@@ -225,14 +300,27 @@ class MicrophoneSlider(SettingSlider):
                 return True
         return False
 
-    def _on_destroy(self, *args):
-        if self.client:
-            self._disconnect_signal(self.client, self._client_mic_changed_sid)
-            self._disconnect_signal(self.client, self._client_changed_init_sid)
+    def _disconnect_stream(self):
+        # Matched disconnect: drops every update_state_idle handler on the stream in one call,
+        # without trusting a stored id that a yanked device may have invalidated.
+        if self.audio_stream is not None and self._stream_changed_sid is not None:
+            with contextlib.suppress(TypeError):
+                self.audio_stream.disconnect_by_func(self.update_state_idle)
+        self._stream_changed_sid = None
 
-        self._disconnect_signal(self.audio_stream, self._stream_changed_sid)
+    def _on_destroy(self, *args):
+        if self._pending_update_sid is not None:
+            GLib.source_remove(self._pending_update_sid)
+            self._pending_update_sid = None
+        if self._volume_flush_sid is not None:
+            GLib.source_remove(self._volume_flush_sid)
+            self._volume_flush_sid = None
+        if self._mic_change_sid is not None:
+            GLib.source_remove(self._mic_change_sid)
+            self._mic_change_sid = None
+
+        self._disconnect_stream()
 
-        self._client_mic_changed_sid = None
         self._client_changed_init_sid = None
         self._stream_changed_sid = None
-        self.audio_stream = None
+        self._set_audio_stream(None)
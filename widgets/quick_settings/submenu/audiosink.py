@@ -1,29 +1,122 @@
+import re
+import shutil
+from functools import lru_cache
+from html import escape
+from typing import Union
+
 import gi
 
 gi.require_version("Gtk", "3.0")
-import contextlib
-
 from fabric.utils import exec_shell_command_async
-from fabric.widgets.box import Box
-from fabric.widgets.image import Image
 from fabric.widgets.label import Label
 from fabric.widgets.scrolledwindow import ScrolledWindow
-from gi.repository import GLib, GObject, Gtk, Pango
+from gi.repository import GLib, GObject, Gtk
 from loguru import logger
 
 from services import audio_service
 from shared.buttons import ScanButton
 from shared.submenu import QuickSubMenu
 from utils.icons import icons
+from utils.widget_utils import connect_object
 
 AudioStream = GObject.Object
 
+_DEVICE_ICONS = icons.get("devices", {})
+_ICON_HEADSET = str(_DEVICE_ICONS.get("headset", "audio-headphones-symbolic"))
+_ICON_SPEAKERS = str(_DEVICE_ICONS.get("speakers", "multimedia-speakers-symbolic"))
+_ICON_DEFAULT = str(_DEVICE_ICONS.get("default_audio_output", "audio-card-symbolic"))
+_ICON_CHECKMARK = str(icons.get("status", {}).get("checkmark") or "object-select-symbolic")
+
+# Sink row layout, built by GtkBuilder straight into C setters instead of through
+# Python widget constructors. The checkmark is on every row (no-show-all) and toggled per default switch.
+_SINK_ROW_UI = f"""<interface>
+  <object class="GtkListBoxRow" id="row">
+    <property name="activatable">True</property>
+    <property name="selectable">True</property>
+    <style><class name="menu-item"/></style>
+    <child>
+      <object class="GtkBox">
+        <property name="orientation">horizontal</property>
+        <property name="spacing">10</property>
+        <property name="margin-start">6</property>
+        <property name="margin-end">6</property>
+        <property name="margin-top">6</property>
+        <property name="margin-bottom">6</property>
+        <child>
+          <object class="GtkImage" id="icon">
+            <property name="icon-name">{escape(_ICON_DEFAULT)}</property>
+            <property name="pixel-size">16</property>
+          </object>
+          <packing><property name="expand">False</property><property name="fill">False</property></packing>
+        </child>
+        <child>
+          <object class="GtkLabel" id="label">
+            <property name="halign">start</property>
+            <property name="hexpand">True</property>
+            <property name="ellipsize">end</property>
+            <style><class name="submenu-item-label"/><class name="sink-name-label"/></style>
+          </object>
+          <packing><property name="expand">True</property><property name="fill">True</property></packing>
+        </child>
+        <child>
+          <object class="GtkImage" id="active_indicator">
+            <property name="name">active-sink-indicator</property>
+            <property name="icon-name">{escape(_ICON_CHECKMARK)}</property>
+            <property name="pixel-size">16</property>
+            <property name="no-show-all">True</property>
+            <property name="visible">False</property>
+          </object>
+          <packing>
+            <property name="pack-type">end</property>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+      </object>
+    </child>
+  </object>
+</interface>
+"""
+
+# One C-level scan per category instead of a Python loop over keywords.
+_HEADSET_RE = re.compile("steelseries|headphone|headset|earphone|arctis|hs80")
+_SPEAKER_RE = re.compile("speaker|hdmi|displayport|line out|analog output")
+
+
+# Pure in (name, description, icon_name), so repeat refreshes of the same sinks hit the cache.
+@lru_cache(maxsize=64)
+def _classify_sink_icon(name: str, description: str, icon_name: Union[str, None]) -> str:
+    # Newline-joined so no keyword can match across the name/description boundary.
+    haystack = f"{name.lower()}\n{description.lower()}"
+
+    if _HEADSET_RE.search(haystack):
+        return _ICON_HEADSET
+
+    if _SPEAKER_RE.search(haystack):
+        return _ICON_SPEAKERS
+
+    if icon_name:
+        return icon_name
+
+    return _ICON_DEFAULT
+
 
 class AudioSinkSubMenu(QuickSubMenu):
     def __init__(self, **kwargs):
         self.client = audio_service
-        self._client_changed_sid = None
-        self._client_speaker_changed_sid = None
+        # pactl works on PulseAudio and on PipeWire via pipewire-pulse; wpctl is the PipeWire-only fallback.
+        self._has_pactl = shutil.which("pactl") is not None
+        self._has_wpctl = shutil.which("wpctl") is not None
+        # (id, name, description) per sink and the default sink id behind the current rows.
+        self._last_sinks_fp = None
+        self._last_default_id = None
+        # Pooled ListBoxRows keyed by sink id.
+        self._rows_by_id = {}
+        # Idle source of the queued refresh; "changed"/"speaker-changed" bursts share it.
+        self._update_sinks_source_id = None
+        self._pending_force_rescan = False
+        # Set when a refresh was requested while the submenu was hidden; replayed on the next map.
+        self._dirty = False
 
         self.scan_button = ScanButton()
 
@@ -34,6 +127,22 @@ class AudioSinkSubMenu(QuickSubMenu):
         )
         self.sink_list_box.get_style_context().add_class("menu")
 
+        # Built once and only shown while there are no sinks. Sink rows are inserted by index
+        # ahead of it, so it always stays last and never shifts their positions.
+        self._placeholder_row = Gtk.ListBoxRow(activatable=False, selectable=False, no_show_all=True)
+        self._placeholder_row.add(
+            Label(
+                label="No playback devices found",
+                style_classes=["menu-item", "placeholder-label"],
+                halign=Gtk.Align.CENTER,
+                valign=Gtk.Align.CENTER,
+                hexpand=True,
+                vexpand=True,
+                visible=True,
+            )
+        )
+        self.sink_list_box.add(self._placeholder_row)
+
         if not hasattr(self, "_on_sink_activated"):
             logger.error("AudioSinkSubMenu FATAL: _on_sink_activated method is not defined before connecting signal!")
         self.sink_list_box.connect("row-activated", self._on_sink_activated)
@@ -59,11 +168,13 @@ class AudioSinkSubMenu(QuickSubMenu):
 
         self.set_hexpand(False)
         if self.client:
-            self._client_changed_sid = self.client.connect("changed", self.update_sinks)
-            self._client_speaker_changed_sid = self.client.connect("speaker-changed", self.update_sinks)
+            # Dropped automatically when the submenu is destroyed.
+            connect_object(self.client, "changed", self.update_sinks)
+            connect_object(self.client, "speaker-changed", self.update_sinks)
 
-        GLib.idle_add(self._do_update_sinks)
+        self.update_sinks()
 
+        self.connect("map", self._on_map)
         self.connect("destroy", self._on_destroy)
 
     def _handle_command_completion(self, stdout: str, stderr: str, exit_code: int, command_desc: str):
@@ -80,19 +191,20 @@ class AudioSinkSubMenu(QuickSubMenu):
         pactl_sink_name = getattr(sink_stream, "name", None)
         wpctl_sink_id_str = str(getattr(sink_stream, "id", None))
 
-        if pactl_sink_name:
+        if pactl_sink_name and self._has_pactl:
             command_pactl = ["pactl", "set-default-sink", pactl_sink_name]
             exec_shell_command_async(
                 command_pactl,
                 lambda out, err, code: self._handle_command_completion(out, err, code, f"pactl set-default-sink {pactl_sink_name}"),
             )
-
-        if wpctl_sink_id_str and wpctl_sink_id_str != "None":
+        elif wpctl_sink_id_str and wpctl_sink_id_str != "None" and self._has_wpctl:
             command_wpctl = ["wpctl", "set-default", wpctl_sink_id_str]
             exec_shell_command_async(
                 command_wpctl,
                 lambda out, err, code: self._handle_command_completion(out, err, code, f"wpctl set-default {wpctl_sink_id_str}"),
             )
+        else:
+            logger.warning("AudioSinkSubMenu: Neither pactl nor wpctl can set the default sink.")
 
     def _on_sink_activated(self, list_box: Gtk.ListBox, row: Gtk.ListBoxRow):
         selected_sink: AudioStream = getattr(row, "_sink_object", None)
@@ -113,33 +225,39 @@ class AudioSinkSubMenu(QuickSubMenu):
             logger.warning("AudioSinkSubMenu: _on_sink_activated called but no _sink_object found on the row.")
 
     def update_sinks(self, *args, force_rescan=False):
-        GLib.idle_add(self._do_update_sinks, force_rescan, priority=GLib.PRIORITY_DEFAULT_IDLE)
+        self._pending_force_rescan = self._pending_force_rescan or force_rescan
+        if not self.get_mapped():
+            self._dirty = True
+            return GLib.SOURCE_REMOVE
+        if self._update_sinks_source_id is None:
+            self._update_sinks_source_id = GLib.idle_add(self._run_update_sinks, priority=GLib.PRIORITY_DEFAULT_IDLE)
         return GLib.SOURCE_REMOVE
 
-    def _get_custom_sink_icon_name(self, sink: AudioStream) -> str:
-        name_lower = (getattr(sink, "name", "") or "").lower()
-        description_lower = (getattr(sink, "description", "") or "").lower()
-        sink_icon_name_prop = getattr(sink, "icon_name", None)
-
-        if "steelseries" in name_lower or "steelseries" in description_lower:
-            return str(icons.get("devices", {}).get("headset", "audio-headphones-symbolic"))
-
-        headphone_keywords = ["headphone", "headset", "earphone", "arctis", "hs80", "headphones"]
-        for keyword in headphone_keywords:
-            if keyword in name_lower or keyword in description_lower:
-                return str(icons.get("devices", {}).get("headset", "audio-headphones-symbolic"))
+    def _on_map(self, *_):
+        if self._dirty:
+            self._dirty = False
+            self.update_sinks()
 
-        speaker_keywords = ["speaker", "hdmi", "displayport", "line out", "analog output", "speakers"]
-        for keyword in speaker_keywords:
-            if keyword in name_lower or keyword in description_lower:
-                is_also_headphone = any(hk_word in name_lower or hk_word in description_lower for hk_word in headphone_keywords)
-                if not is_also_headphone:
-                    return str(icons.get("devices", {}).get("speakers", "multimedia-speakers-symbolic"))
-
-        if sink_icon_name_prop and isinstance(sink_icon_name_prop, str):
-            return sink_icon_name_prop
+    def _on_destroy(self, *args):
+        # _run_update_sinks clears the id before doing any work, so a non-None id is
+        # always a live source and never one that already fired and removed itself.
+        if self._update_sinks_source_id is not None:
+            GLib.source_remove(self._update_sinks_source_id)
+            self._update_sinks_source_id = None
+
+    def _run_update_sinks(self):
+        self._update_sinks_source_id = None
+        force_rescan = self._pending_force_rescan
+        self._pending_force_rescan = False
+        return self._do_update_sinks(force_rescan)
 
-        return str(icons.get("devices", {}).get("default_audio_output", "audio-card-symbolic"))
+    def _get_custom_sink_icon_name(self, sink: AudioStream) -> str:
+        sink_icon_name_prop = getattr(sink, "icon_name", None)
+        return _classify_sink_icon(
+            getattr(sink, "name", "") or "",
+            getattr(sink, "description", "") or "",
+            sink_icon_name_prop if isinstance(sink_icon_name_prop, str) else None,
+        )
 
     def _do_update_sinks(self, force_rescan=False):
         if not isinstance(self.sink_list_box, Gtk.Widget) or not self.sink_list_box.get_realized():
@@ -154,82 +272,96 @@ class AudioSinkSubMenu(QuickSubMenu):
         if hasattr(self.scan_button, "play_animation"):
             self.scan_button.play_animation()
 
-        for child in self.sink_list_box.get_children():
-            self.sink_list_box.remove(child)
-
         available_sinks: list[AudioStream] = self.client.speakers if self.client and hasattr(self.client, "speakers") else []
         current_default_sink: AudioStream = self.client.speaker if self.client and hasattr(self.client, "speaker") else None
 
-        if not available_sinks:
-            self.sink_list_box.add(
-                Label(
-                    label="No playback devices found",
-                    style_classes=["menu-item", "placeholder-label"],
-                    halign=Gtk.Align.CENTER,
-                    valign=Gtk.Align.CENTER,
-                    hexpand=True,
-                    vexpand=True,
-                )
-            )
-        else:
-            current_default_sink_id_val = getattr(current_default_sink, "id", None) if current_default_sink else None
-
-            for sink in available_sinks:
-                row = Gtk.ListBoxRow(activatable=True, selectable=True)
-                row.get_style_context().add_class("menu-item")
-                row._sink_object = sink
-
-                is_active = current_default_sink_id_val is not None and hasattr(sink, "id") and sink.id == current_default_sink_id_val
-
-                item_box = Box(orientation="h", spacing=10, hexpand=False)
-                item_box.set_margin_start(6)
-                item_box.set_margin_end(6)
-                item_box.set_margin_top(6)
-                item_box.set_margin_bottom(6)
-
-                chosen_icon_name = self._get_custom_sink_icon_name(sink)
-                icon = Image(icon_name=chosen_icon_name, icon_size=16)
-                item_box.pack_start(icon, False, False, 0)
-
-                full_display_text = (getattr(sink, "description", "").strip() or getattr(sink, "name", "")).strip() or "Unknown Sink"
-
-                name_label = Label(
-                    label=full_display_text,
-                    style_classes=["submenu-item-label", "sink-name-label"],
-                    h_align=Gtk.Align.START,
-                    ellipsization=Pango.EllipsizeMode.END,
-                    tooltip_text=full_display_text,
-                    hexpand=True,
-                )
-                item_box.pack_start(name_label, True, True, 0)
-
-                if is_active:
-                    active_icon_name_raw = icons.get("status", {}).get("checkmark", "object-select-symbolic")
-                    active_icon_name = str(active_icon_name_raw) if active_icon_name_raw is not None else "object-select-symbolic"
-                    active_indicator = Image(icon_name=active_icon_name, icon_size=16, name="active-sink-indicator")
-                    item_box.pack_end(active_indicator, False, False, 0)
-                    row.get_style_context().add_class("active-sink")
-
-                row.add(item_box)
-                self.sink_list_box.add(row)
-
-        self.sink_list_box.show_all()
+        sinks_fp = tuple((getattr(s, "id", None), getattr(s, "name", None), getattr(s, "description", None)) for s in available_sinks)
+        default_id = getattr(current_default_sink, "id", None) if current_default_sink else None
+
+        if force_rescan or sinks_fp != self._last_sinks_fp:
+            # Hold child-notify while rows are added, moved and removed so the ListBox
+            # handles the whole sync as one batch instead of per add/remove.
+            self.sink_list_box.freeze_child_notify()
+            try:
+                self._sync_sink_rows(available_sinks, current_default_sink)
+            finally:
+                self.sink_list_box.thaw_child_notify()
+            self.sink_list_box.show_all()
+        elif default_id != self._last_default_id:
+            # Same sinks, new default: just move the checkmark.
+            self._update_active_sink(default_id)
+        self._last_sinks_fp = sinks_fp
+        self._last_default_id = default_id
+
         if hasattr(self.scan_button, "set_sensitive"):
             self.scan_button.set_sensitive(True)
         if hasattr(self.scan_button, "stop_animation"):
             self.scan_button.stop_animation()
         return GLib.SOURCE_REMOVE
 
-    def _disconnect_signal(self, obj, sid):
-        if obj and sid is not None and hasattr(obj, "handler_is_connected") and obj.handler_is_connected(sid):
-            with contextlib.suppress(Exception):
-                obj.disconnect(sid)
-                return True
-        return False
-
-    def _on_destroy(self, *args):
-        if self.client:
-            self._disconnect_signal(self.client, self._client_changed_sid)
-            self._disconnect_signal(self.client, self._client_speaker_changed_sid)
-        self._client_changed_sid = None
-        self._client_speaker_changed_sid = None
+    def _sync_sink_rows(self, available_sinks: list[AudioStream], current_default_sink: AudioStream):
+        # Rows are pooled by sink id: surviving sinks keep their row and are only re-filled,
+        # so a refresh allocates widgets just for sinks that actually appeared.
+        self._placeholder_row.set_visible(not available_sinks)
+
+        current_default_sink_id_val = getattr(current_default_sink, "id", None) if current_default_sink else None
+        stale_rows = self._rows_by_id
+        self._rows_by_id = {}
+
+        for index, sink in enumerate(available_sinks):
+            sink_id = getattr(sink, "id", None)
+            row = stale_rows.pop(sink_id, None)
+            if row is None:
+                row = self._make_sink_row()
+                self.sink_list_box.insert(row, index)
+            elif row.get_index() != index:
+                self.sink_list_box.remove(row)
+                self.sink_list_box.insert(row, index)
+            self._rows_by_id[sink_id] = row
+
+            is_active = current_default_sink_id_val is not None and sink_id == current_default_sink_id_val
+            self._fill_sink_row(row, sink, is_active)
+
+        # destroy() unparents and frees the row in one step, dropping its sink reference
+        # now instead of whenever the Python wrapper happens to be collected.
+        for row in stale_rows.values():
+            row.destroy()
+
+    def _make_sink_row(self) -> Gtk.ListBoxRow:
+        builder = Gtk.Builder.new_from_string(_SINK_ROW_UI, -1)
+        row = builder.get_object("row")
+        row._icon = builder.get_object("icon")
+        row._label = builder.get_object("label")
+        row._active_indicator = builder.get_object("active_indicator")
+        row._sink_object = None
+        row._icon_name = None
+        row._text = None
+        return row
+
+    def _fill_sink_row(self, row: Gtk.ListBoxRow, sink: AudioStream, is_active: bool):
+        row._sink_object = sink
+
+        icon_name = self._get_custom_sink_icon_name(sink)
+        if icon_name != row._icon_name:
+            row._icon.set_from_icon_name(icon_name, Gtk.IconSize.MENU)
+            row._icon_name = icon_name
+
+        full_display_text = (getattr(sink, "description", "").strip() or getattr(sink, "name", "")).strip() or "Unknown Sink"
+        if full_display_text != row._text:
+            row._label.set_label(full_display_text)
+            row._label.set_tooltip_text(full_display_text)
+            row._text = full_display_text
+
+        self._set_row_active(row, is_active)
+
+    def _update_active_sink(self, default_id):
+        for sink_id, row in self._rows_by_id.items():
+            self._set_row_active(row, default_id is not None and sink_id == default_id)
+
+    def _set_row_active(self, row: Gtk.ListBoxRow, is_active: bool):
+        row._active_indicator.set_visible(is_active)
+        style_context = row.get_style_context()
+        if is_active:
+            style_context.add_class("active-sink")
+        else:
+            style_context.remove_class("active-sink")